@@ -6,7 +6,7 @@ import stat
 import sys
 import tempfile
 from pathlib import Path
-from typing import Iterator, List, Tuple
+from typing import Iterator, List, Optional, Tuple
 
 import click
 
@@ -62,7 +62,7 @@ def _export(variable: str, value: str) -> None:
 
 def _guess_wrapped() -> Iterator[Tuple[str, str]]:
     for tool in BuildTool:
-        tool_path = os.getenv(tool.env)
+        tool_path = os.environ.get(tool.env)
         if tool_path is None:
             tool_path = shutil.which(tool.cmd)
             if tool_path is None:
@@ -157,6 +157,12 @@ def env(
     help="The path to use for action journaling",
     type=click.Path(dir_okay=False, exists=False, path_type=Path),
 )
+@click.option(
+    "--cache-dir",
+    metavar="DIR",
+    help="The directory to share cached state (e.g. compiler fingerprints) in",
+    type=click.Path(file_okay=False, exists=False, resolve_path=True, path_type=Path),
+)
 @click.argument("target")
 @click.argument("args", nargs=-1)
 def exec_(
@@ -166,6 +172,7 @@ def exec_(
     shims: List[str],
     actions: List[str],
     journal_path: click.Path,
+    cache_dir: Optional[Path],
     target: str,
     args: List[str],
 ) -> None:
@@ -185,6 +192,14 @@ def exec_(
     if journal_path is not None:
         env["BLIGHT_JOURNAL_PATH"] = str(journal_path)
 
+    # Every tool invocation in the build shares a single cache directory, meaning that
+    # expensive per-tool work (like compiler fingerprinting) happens once per build
+    # rather than once per invocation.
+    # NOTE: We don't create a temporary cache directory by default, since we replace
+    # ourselves with the target below and would never get a chance to clean it up.
+    if cache_dir is not None:
+        env["BLIGHT_CACHE_DIR"] = str(cache_dir)
+
     env.update({tool.env: tool.blight_tool.value for tool in BuildTool})
 
     logger.debug(f"built environment: {env}")
@@ -204,6 +219,6 @@ def tool() -> None:
     tool_class = getattr(blight.tool, blight_tool.build_tool.value)
     tool = tool_class(sys.argv[1:])
     try:
-        tool.run()
+        tool.run(replace_process=True)
     except BlightError as e:
         die(str(e))
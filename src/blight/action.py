@@ -13,6 +13,16 @@ class Action:
     A generic action, run with every tool (both before and after the tool's execution).
     """
 
+    parallel_safe: bool = False
+    """
+    Whether this action can be run concurrently with other actions, when
+    `BLIGHT_ACTIONS_PARALLEL` is set.
+
+    Only actions that observe the tool without modifying it (such as its arguments),
+    and that don't depend on the order in which actions are run, should set this
+    to `True`.
+    """
+
     def __init__(self, config: Dict[str, str]):
         self._config = config
         self._result: Optional[Dict[str, Any]] = None
@@ -41,6 +41,8 @@ class BenchmarkRecord(BaseModel):
 
 
 class Benchmark(Action):
+    parallel_safe = True
+
     def before_run(self, tool: Tool) -> None:
         self._start_nanos = time.monotonic_ns()
 
@@ -51,6 +53,9 @@ class Benchmark(Action):
         if tool.is_journaling():
             self._result = bench.dict()
         else:
+            # NOTE: Serialize before taking the lock, so that concurrent tools only
+            # contend with each other for the write itself.
+            record = bench.json()
             bench_file = Path(self._config["output"])
             with flock_append(bench_file) as io:
-                print(bench.json(), file=io)
+                io.write(f"{record}\n")
@@ -51,4 +51,4 @@ class CCForCXX(CCAction):
         # * Check for common C++-only linkages, like -lstdc++fs
         # * Check whether tool.inputs contains files that look like C++
         if tool.std.is_cxxstd():
-            tool.args[:0] = ["-x", "c++"]
+            tool.args = ["-x", "c++", *tool.args]
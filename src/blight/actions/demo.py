@@ -9,6 +9,8 @@ from blight.tool import Tool
 
 
 class Demo(Action):
+    parallel_safe = True
+
     def before_run(self, tool: Tool) -> None:
         print(f"[demo] before-run: {tool.wrapped_tool()}", file=sys.stderr)
 
@@ -80,6 +80,8 @@ class InputsRecord(BaseModel):
 
 
 class FindInputs(Action):
+    parallel_safe = True
+
     def before_run(self, tool: Tool) -> None:
         inputs = []
         for input in tool.inputs:
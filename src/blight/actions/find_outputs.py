@@ -86,6 +86,8 @@ class OutputsRecord(BaseModel):
 
 
 class FindOutputs(Action):
+    parallel_safe = True
+
     def before_run(self, tool: Tool) -> None:
         outputs = []
         for output in tool.outputs:
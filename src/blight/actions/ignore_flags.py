@@ -3,11 +3,11 @@ The `IgnoreFlags` action.
 """
 
 import logging
-import shlex
 
 from blight.action import CompilerAction
 from blight.enums import Lang
 from blight.tool import CompilerTool
+from blight.util import shell_split
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +34,7 @@ class IgnoreFlags(CompilerAction):
     # substitution principle violation -- it can't see that `CompilerAction`
     # is safely specialized for `CompilerTool`.
     def before_run(self, tool: CompilerTool) -> None:  # type: ignore
-        ignore_flags = shlex.split(self._config.get("FLAGS", ""))
+        ignore_flags = shell_split(self._config.get("FLAGS", ""))
         if tool.lang in [Lang.C, Lang.Cxx]:
             tool.args = [a for a in tool.args if a not in ignore_flags]
         else:
@@ -3,11 +3,12 @@ The `InjectFlags` action.
 """
 
 import logging
-import shlex
+from typing import Dict, List
 
 from blight.action import CompilerAction
 from blight.enums import CompilerStage, Lang
 from blight.tool import CompilerTool
+from blight.util import shell_split
 
 logger = logging.getLogger(__name__)
 
@@ -38,25 +39,34 @@ class InjectFlags(CompilerAction):
     (unless it's a C++ invocation, e.g. via `-x c++`).
     """
 
+    def __init__(self, config: Dict[str, str]) -> None:
+        super().__init__(config)
+        self._split_flags: Dict[str, List[str]] = {}
+
+    def _flags(self, name: str) -> List[str]:
+        # NOTE: Our configuration never changes, so each set of flags is only
+        # split once (and only if it's actually needed).
+        flags = self._split_flags.get(name)
+        if flags is None:
+            flags = self._split_flags[name] = shell_split(self._config.get(name, ""))
+        return flags
+
     # NOTE(ww): type ignore here because mypy thinks this is a Liskov
     # substitution principle violation -- it can't see that `CompilerAction`
     # is safely specialized for `CompilerTool`.
     def before_run(self, tool: CompilerTool) -> None:  # type: ignore
-        cflags = shlex.split(self._config.get("CFLAGS", ""))
-        cflags_linker = shlex.split(self._config.get("CFLAGS_LINKER", ""))
-        cxxflags = shlex.split(self._config.get("CXXFLAGS", ""))
-        cxxflags_linker = shlex.split(self._config.get("CXXFLAGS_LINKER", ""))
-        cppflags = shlex.split(self._config.get("CPPFLAGS", ""))
-
-        if tool.lang == Lang.C:
-            tool.args += cflags
-            tool.args += cppflags
-            if tool.stage is CompilerStage.AllStages:
-                tool.args += cflags_linker
-        elif tool.lang == Lang.Cxx:
-            tool.args += cxxflags
-            tool.args += cppflags
-            if tool.stage is CompilerStage.AllStages:
-                tool.args += cxxflags_linker
+        lang = tool.lang
+        if lang == Lang.C:
+            flags, linker_flags = "CFLAGS", "CFLAGS_LINKER"
+        elif lang == Lang.Cxx:
+            flags, linker_flags = "CXXFLAGS", "CXXFLAGS_LINKER"
         else:
             logger.debug("not injecting flags for an unknown language")
+            return
+
+        tool.args = [*tool.args, *self._flags(flags), *self._flags("CPPFLAGS")]
+
+        # NOTE: The stage is checked after injecting the flags above, since they
+        # may change it (e.g. `CFLAGS=-c`).
+        if tool.stage is CompilerStage.AllStages and self._flags(linker_flags):
+            tool.args = [*tool.args, *self._flags(linker_flags)]
@@ -27,6 +27,8 @@ class Lint(CompilerAction):
     ```
     """
 
+    parallel_safe = True
+
     # NOTE(ww): type ignore here because mypy thinks this is a Liskov
     # substitution principle violation -- it can't see that `CompilerAction`
     # is safely specialized for `CompilerTool`.
@@ -19,6 +19,8 @@ from blight.util import flock_append
 
 
 class Record(Action):
+    parallel_safe = True
+
     def after_run(self, tool: Tool, *, run_skipped: bool = False) -> None:
         # TODO(ww): Restructure this dictionary; it should be more like:
         # { run: {...}, tool: {...}}
@@ -28,6 +30,9 @@ class Record(Action):
         if tool.is_journaling():
             self._result = tool_record
         else:
+            # NOTE: Serialize before taking the lock, so that concurrent tools only
+            # contend with each other for the write itself.
+            record = json.dumps(tool_record)
             record_file = Path(self._config["output"])
             with flock_append(record_file) as io:
-                print(json.dumps(tool_record), file=io)
+                io.write(f"{record}\n")
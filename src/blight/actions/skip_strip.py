@@ -12,6 +12,8 @@ from blight.tool import STRIP
 
 
 class SkipStrip(STRIPAction):
+    parallel_safe = True
+
     # NOTE(ww): type ignore here because mypy thinks this is a Liskov
     # substitution principle violation -- it can't see that `CompilerAction`
     # is safely specialized for `CompilerTool`.
@@ -4,7 +4,7 @@ Constant tables and maps for various blight APIs and actions.
 
 from blight.enums import InputKind, OutputKind
 
-COMPILER_FLAG_INJECTION_VARIABLES = {"CL", "_CL_", "CCC_OVERRIDE_OPTIONS"}
+COMPILER_FLAG_INJECTION_VARIABLES = frozenset({"CL", "_CL_", "CCC_OVERRIDE_OPTIONS"})
 """
 Environment variables that some compiler frontends use to do their own
 flag injection.
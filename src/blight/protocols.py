@@ -5,10 +5,13 @@ These are, generally speaking, an implementation detail.
 """
 
 from pathlib import Path
-from typing import Dict, List, Protocol
+from typing import TYPE_CHECKING, Dict, List, Protocol
 
 from blight.enums import Lang
 
+if TYPE_CHECKING:
+    from blight.tool import _ArgIndex  # pragma: no cover
+
 
 class CwdProtocol(Protocol):
     @property
@@ -28,13 +31,19 @@ class CanonicalizedArgsProtocol(ArgsProtocol, Protocol):
         ...  # pragma: no cover
 
 
-class LangProtocol(CanonicalizedArgsProtocol, Protocol):
+class ArgIndexProtocol(CanonicalizedArgsProtocol, Protocol):
+    @property
+    def _arg_index(self) -> "_ArgIndex":
+        ...  # pragma: no cover
+
+
+class LangProtocol(ArgIndexProtocol, Protocol):
     @property
     def lang(self) -> Lang:
         ...  # pragma: no cover
 
 
-class IndexedUndefinesProtocol(CanonicalizedArgsProtocol, Protocol):
+class IndexedUndefinesProtocol(ArgIndexProtocol, Protocol):
     @property
     def indexed_undefines(self) -> Dict[str, int]:
         ...  # pragma: no cover
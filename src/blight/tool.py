@@ -2,15 +2,21 @@
 Encapsulations of the tools supported by blight.
 """
 
-import itertools
+import argparse
+import concurrent.futures
+import dataclasses
+import functools
 import json
 import logging
 import os
 import re
 import shlex
+import shutil
+import stat
 import subprocess
+import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
 from blight import util
 from blight.constants import COMPILER_FLAG_INJECTION_VARIABLES
@@ -26,12 +32,15 @@ from blight.enums import (
 )
 from blight.exceptions import BlightError, BuildError, SkipRun
 from blight.protocols import (
-    CanonicalizedArgsProtocol,
+    ArgIndexProtocol,
     IndexedUndefinesProtocol,
     LangProtocol,
 )
 from blight.util import json_helper
 
+if TYPE_CHECKING:
+    from blight.action import Action  # pragma: no cover
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,6 +52,379 @@ Neither clang nor GCC is explicit in their documentation about their recursion l
 if they have any. We choose an arbitrary limit here.
 """
 
+FAMILY_CACHE_FILENAME = "family.jsonl"
+"""
+The name of the compiler family cache file, relative to `$BLIGHT_CACHE_DIR`.
+"""
+
+_STAGE_FLAG_MAP = {
+    # NOTE(ww): See the TODO in CompilerStage.
+    "-v": CompilerStage.Unknown,
+    "-###": CompilerStage.Unknown,
+    "-E": CompilerStage.Preprocess,
+    "-fsyntax-only": CompilerStage.SyntaxOnly,
+    "-S": CompilerStage.Assemble,
+    "-c": CompilerStage.CompileObject,
+}
+
+_STAGE_OUTPUT_SUFFIX_MAP = {
+    CompilerStage.Assemble: ".s",
+    CompilerStage.CompileObject: ".o",
+}
+"""
+The suffix of each per-input output file produced by compiler stages that have them.
+"""
+
+_ARCHIVE_SUFFIXES = (".a",)
+"""
+Suffixes that `AR.outputs` recognizes as archive filenames.
+"""
+
+_FILENAME_CONSUMER_FLAGS = frozenset({"-aux-info", "-o"})
+"""
+Flags whose filename argument is passed separately (e.g. `-o foo`), and therefore
+mustn't be mistaken for one of `Tool.inputs`.
+"""
+
+_X_LANG_MAP = {"c": Lang.C, "c-header": Lang.C, "c++": Lang.Cxx, "c++-header": Lang.Cxx}
+
+_STD_FLAG_MAP = {
+    # C89 flags.
+    "-std=c89": Std.C89,
+    "-std=c90": Std.C89,
+    "-std=iso9899:1990": Std.C89,
+    # C94 flags.
+    "-std=iso9899:199409": Std.C94,
+    # C99 flags.
+    "-std=c99": Std.C99,
+    "-std=c9x": Std.C99,
+    "-std=iso9899:1999": Std.C99,
+    "-std=iso9899:199x": Std.C99,
+    # C11 flags.
+    "-std=c11": Std.C11,
+    "-std=c1x": Std.C11,
+    "-std=iso9899:2011": Std.C11,
+    # C17 flags.
+    "-std=c17": Std.C17,
+    "-std=c18": Std.C17,
+    "-std=iso9899:2017": Std.C17,
+    "-std=iso9899:2018": Std.C17,
+    # C20 (presumptive) flags.
+    "-std=c2x": Std.C2x,
+    # GNU89 flags.
+    "-std=gnu89": Std.Gnu89,
+    "-std=gnu90": Std.Gnu89,
+    # GNU99 flags.
+    "-std=gnu99": Std.Gnu99,
+    "-std=gnu9x": Std.Gnu99,
+    # GNU11 flags.
+    "-std=gnu11": Std.Gnu11,
+    "-std=gnu1x": Std.Gnu11,
+    # GNU17 flags.
+    "-std=gnu17": Std.Gnu17,
+    "-std=gnu18": Std.Gnu17,
+    # GNU20 (presumptive) flags.
+    "-std=gnu2x": Std.Gnu2x,
+    # C++03 flags.
+    # NOTE(ww): Both gcc and clang treat C++98 mode as C++03 mode.
+    "-std=c++98": Std.Cxx03,
+    "-std=c++03": Std.Cxx03,
+    # C++11 flags.
+    "-std=c++11": Std.Cxx11,
+    "-std=c++0x": Std.Cxx11,
+    # C++14 flags.
+    "-std=c++14": Std.Cxx14,
+    "-std=c++1y": Std.Cxx14,
+    # C++17 flags.
+    "-std=c++17": Std.Cxx17,
+    "-std=c++1z": Std.Cxx17,
+    # C++20 (presumptive) flags.
+    "-std=c++2a": Std.Cxx2a,
+    "-std=c++20": Std.Cxx2a,
+    # GNU++03 flags.
+    "-std=gnu++98": Std.Gnuxx03,
+    "-std=gnu++03": Std.Gnuxx03,
+    # GNU++11 flags.
+    "-std=gnu++11": Std.Gnuxx11,
+    "-std=gnu++0x": Std.Gnuxx11,
+    # GNU++14 flags.
+    "-std=gnu++14": Std.Gnuxx14,
+    "-std=gnu++1y": Std.Gnuxx14,
+    # GNU++17 flags.
+    "-std=gnu++17": Std.Gnuxx17,
+    "-std=gnu++1z": Std.Gnuxx17,
+    # GNU++20 (presumptive) flags.
+    "-std=gnu++2a": Std.Gnuxx2a,
+    "-std=gnu++20": Std.Gnuxx2a,
+}
+
+_OPT_FLAG_MAP = {
+    "-O0": OptLevel.O0,
+    "-O": OptLevel.O1,
+    "-O1": OptLevel.O1,
+    "-O2": OptLevel.O2,
+    "-O3": OptLevel.O3,
+    "-Ofast": OptLevel.OFast,
+    "-Os": OptLevel.OSize,
+    "-Oz": OptLevel.OSizeZ,
+    "-Og": OptLevel.ODebug,
+}
+
+_CODE_MODEL_MAP = {
+    "-mcmodel=small": CodeModel.Small,
+    "-mcmodel=medlow": CodeModel.Small,
+    "-mcmodel=medium": CodeModel.Medium,
+    "-mcmodel=medany": CodeModel.Medium,
+    "-mcmodel=large": CodeModel.Large,
+    "-mcmodel=kernel": CodeModel.Kernel,
+}
+
+_INDEXED_ARG_PATTERN = re.compile(
+    r"""
+    (?P<stage>-v|-\#\#\#|-E|-fsyntax-only|-S|-c)$
+    |(?P<ansi>-ansi)$
+    |(?P<std>-std=)
+    |(?P<opt>-O)
+    |(?P<lang>-x)
+    |(?P<code_model>-mcmodel=)
+    |(?P<define>-D)
+    |(?P<undefine>-U)
+    |(?P<library_search_path>-L|--library-path(?:=|$))
+    |(?P<library_name>-l|--library(?:=|$))
+    |(?P<long_output>--output(?:=|$))
+    |(?P<output>-o)
+    """,
+    re.VERBOSE,
+)
+"""
+Classifies each argument of interest to `Tool._arg_index` by its prefix, in a single match.
+"""
+
+
+_FAMILY_BASENAME_PATTERN = re.compile(r"(?P<frontend>clang|clang\+\+|tcc)(-\d+(\.\d+)*)?")
+
+
+def _compiler_family(wrapped_tool: str) -> CompilerFamily:
+    """
+    Returns the `CompilerFamily` for the given wrapped compiler frontend.
+
+    Fingerprints are memoized on the frontend's resolved path, modification
+    time, size, and inode, so a compiler that's upgraded in-place gets
+    fingerprinted again.
+    """
+    family = _guess_family(wrapped_tool)
+    if family is not None:
+        return family
+
+    path = shutil.which(wrapped_tool) or wrapped_tool
+    try:
+        path_stat = os.stat(path)
+        file_key: Optional[Tuple[int, int, int]] = (
+            path_stat.st_mtime_ns,
+            path_stat.st_size,
+            path_stat.st_ino,
+        )
+    except OSError:
+        file_key = None
+
+    return _fingerprint(path, file_key)
+
+
+def _guess_family(wrapped_tool: str) -> Optional[CompilerFamily]:
+    """
+    Returns the `CompilerFamily` implied by the wrapped frontend's name (e.g. `clang-17`),
+    or `None` if the name doesn't reliably identify a family.
+
+    Only names that can't plausibly belong to another family are trusted: `tcc`,
+    and `clang`/`clang++` outside of macOS (where they're Apple's clang). `gcc` and
+    `g++` are **not** trusted, since they're frequently aliases for clang (e.g. on
+    macOS and Termux). Symlinks aren't resolved, so a `clang` that's really a link
+    to some other compiler will be misidentified.
+    """
+    match = _FAMILY_BASENAME_PATTERN.fullmatch(os.path.basename(wrapped_tool))
+    if match is None:
+        return None
+
+    if match.group("frontend") == "tcc":
+        return CompilerFamily.Tcc
+
+    # NOTE: Apple's clang identifies as `AppleLlvm`, which we can only tell
+    # by fingerprinting.
+    if sys.platform == "darwin":
+        return None
+
+    return CompilerFamily.MainlineLlvm
+
+
+@functools.lru_cache(maxsize=32)
+def _fingerprint(path: str, file_key: Optional[Tuple[int, int, int]]) -> CompilerFamily:
+    # NOTE: Fingerprinting means spawning the frontend, which is expensive
+    # relative to everything else a single blight invocation does. When the user
+    # gives us a cache directory, we share fingerprints between every blight process
+    # (i.e., across an entire `make -j` build) instead of just within this one.
+    cache_dir = os.environ.get("BLIGHT_CACHE_DIR")
+    if cache_dir is None or file_key is None:
+        return _run_fingerprint(path)
+
+    # NOTE: The cache is strictly an optimization, so an unreadable or unwritable
+    # cache directory means fingerprinting as if there were no cache at all.
+    cache_file = Path(cache_dir) / FAMILY_CACHE_FILENAME
+    try:
+        if cache_file.is_file():
+            with cache_file.open() as io:
+                for line in io:
+                    try:
+                        record = json.loads(line)
+                        record_key = (record["mtime_ns"], record["size"], record["ino"])
+                        if record["path"] == path and record_key == file_key:
+                            return CompilerFamily[record["family"]]
+                    except (ValueError, KeyError, TypeError):
+                        logger.debug(f"skipping malformed family cache record: {line!r}")
+    except OSError as e:
+        logger.debug(f"couldn't read family cache: {e}")
+
+    family = _run_fingerprint(path)
+
+    try:
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        with util.flock_append(cache_file) as io:
+            mtime_ns, size, ino = file_key
+            record = {
+                "path": path,
+                "mtime_ns": mtime_ns,
+                "size": size,
+                "ino": ino,
+                "family": family.name,
+            }
+            print(json.dumps(record), file=io)
+    except OSError as e:
+        logger.debug(f"couldn't write family cache: {e}")
+
+    return family
+
+
+def _run_fingerprint(path: str) -> CompilerFamily:
+    # NOTE(ww): Both GCC and Clang support -### as an alias for -v, but
+    # with additional guarantees around argument quoting. Do other families support it?
+
+    # NOTE: Only stderr is interesting here; stdout is discarded rather than piped.
+    result = subprocess.run(
+        [path, "-###"], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, close_fds=False
+    )
+
+    # If the command exited with an error, we're likely dealing with a frontend
+    # that doesn't understand `-###`.
+    if result.returncode != 0:
+        logger.warning("compiler fingerprint failed: frontend didn't recognize -###?")
+        # ...but even still, we can infer a bit from the error message.
+        if b"tcc: error" in result.stderr:
+            return CompilerFamily.Tcc
+        else:
+            return CompilerFamily.Unknown
+
+    # We expect the relevant parts of `-###` on stderr. The lack of any output
+    # again suggests that the frontend doesn't understand the flag.
+    if not result.stderr:
+        logger.warning("compiler fingerprint failed: frontend didn't produce output for -###?")
+        return CompilerFamily.Unknown
+
+    # Finally, we do some silly substring checks.
+    # TODO(ww): Better heuristics here?
+    if b"Apple clang version" in result.stderr:
+        return CompilerFamily.AppleLlvm
+    elif b"clang version" in result.stderr:
+        return CompilerFamily.MainlineLlvm
+    elif b"gcc version" in result.stderr:
+        return CompilerFamily.Gcc
+    else:
+        return CompilerFamily.Unknown
+
+
+def _rename_suffix(path: str, suffix: str) -> str:
+    """
+    Returns the filename component of `path` with its suffix replaced by `suffix`,
+    like `Path(path).with_suffix(suffix).name` but without building any paths.
+    """
+    name = path.rstrip("/").rsplit("/", 1)[-1]
+
+    # NOTE: Like `pathlib`, leading dots (e.g. `.bashrc`) and trailing dots (e.g. `foo.`)
+    # don't begin a suffix.
+    dot = name.rfind(".")
+    if 0 < dot < len(name) - 1:
+        name = name[:dot]
+    return name + suffix
+
+
+@dataclasses.dataclass
+class _ArgIndex:
+    """
+    An index of the arguments that blight's tool models care about, built in a single
+    pass over a tool's canonicalized arguments.
+
+    Each `last_*` field is the index of the rightmost argument with the corresponding
+    prefix, or `None` if there is no such argument.
+    """
+
+    last_lang: Optional[int] = None
+    """
+    The last `-x lang` or `-xlang` argument.
+    """
+
+    last_std: Optional[int] = None
+    """
+    The last `-std=STD` argument.
+    """
+
+    last_opt: Optional[int] = None
+    """
+    The last `-Olevel` argument.
+    """
+
+    last_code_model: Optional[int] = None
+    """
+    The last `-mcmodel=MODEL` argument.
+    """
+
+    ansi: bool = False
+    """
+    Whether `-ansi` is present.
+    """
+
+    stage_flags: Set[str] = dataclasses.field(default_factory=set)
+    """
+    Every stage-selecting flag (e.g. `-c`) that's present.
+    """
+
+    defines: List[Tuple[int, str]] = dataclasses.field(default_factory=list)
+    """
+    A list of `(index, "name[=value]")` for each `-D` argument.
+    """
+
+    undefines: Dict[str, int] = dataclasses.field(default_factory=dict)
+    """
+    A dict of `name: index` for the rightmost `-U` argument of each name.
+    """
+
+    library_search_paths: List[str] = dataclasses.field(default_factory=list)
+    """
+    The path of each `-L` or `--library-path` argument, in argument order.
+    """
+
+    library_names: List[str] = dataclasses.field(default_factory=list)
+    """
+    The name of each `-l` or `--library` argument, in argument order.
+    """
+
+    output: Optional[str] = None
+    """
+    The value of the rightmost `-o` argument.
+    """
+
+    long_output: Optional[str] = None
+    """
+    The value of the rightmost `--output` argument.
+    """
+
 
 class Tool:
     """
@@ -71,6 +453,18 @@ class Tool:
     `Tool` instances cannot be created directory; a specific subclass must be used.
     """
 
+    _ARGS_CACHED_PROPERTIES: Tuple[str, ...] = (
+        "inputs",
+        "outputs",
+        "stage",
+        "_arg_index",
+        "explicit_library_search_paths",
+    )
+    """
+    The names of all `functools.cached_property`s that derive from this tool's arguments,
+    and therefore need to be recomputed whenever the arguments change.
+    """
+
     @classmethod
     def build_tool(cls) -> BuildTool:
         """
@@ -85,12 +479,19 @@ class Tool:
         """
         return cls.build_tool().blight_tool
 
+    # NOTE: Only the name of the environment variable is cached, not its value:
+    # the wrapped tool can legitimately change over the lifetime of a process.
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _wrapped_tool_env(cls) -> str:
+        return cls.blight_tool().env
+
     @classmethod
     def wrapped_tool(cls) -> str:
         """
         Returns the executable name or path of the tool that this blight tool wraps.
         """
-        wrapped_tool = os.getenv(cls.blight_tool().env)
+        wrapped_tool = os.environ.get(cls._wrapped_tool_env())
         if wrapped_tool is None:
             raise BlightError(f"No wrapped tool found for {cls.build_tool()}")
         return wrapped_tool
@@ -101,11 +502,14 @@ class Tool:
         self._args = args
         self._canonicalized_args = args.copy()
         self._env = self._fixup_env()
-        self._cwd = Path(os.getcwd()).resolve()
+        # NOTE: `getcwd(3)` always returns an absolute path with any symlinks already
+        # resolved, so there's no need to resolve it again.
+        self._cwd = Path(os.getcwd())
         self._actions = util.load_actions()
         self._skip_run = False
         self._action_results: Dict[str, Optional[Dict[str, Any]]] = {}
-        self._journal_path = os.getenv("BLIGHT_JOURNAL_PATH")
+        self._journal_path = os.environ.get("BLIGHT_JOURNAL_PATH")
+        self._actions_parallel = os.environ.get("BLIGHT_ACTIONS_PARALLEL") == "1"
 
     def _fixup_env(self) -> Dict[str, str]:
         """
@@ -116,35 +520,86 @@ class Tool:
         env["PATH"] = util.unswizzled_path()
         return env
 
+    def _run_actions(self, run_action: Callable[["Action"], None]) -> None:
+        """
+        Calls `run_action` on each of this tool's actions, in order.
+
+        In "parallel" mode, consecutive actions that are `parallel_safe` are run
+        concurrently instead. Actions that aren't parallel-safe are always run on their
+        own, after every action before them has completed.
+        """
+        batches: List[List[Action]] = []
+        if self._actions_parallel:
+            for action in self._actions:
+                if action.parallel_safe and batches and batches[-1][-1].parallel_safe:
+                    batches[-1].append(action)
+                else:
+                    batches.append([action])
+
+        # NOTE: A thread pool is only worth creating if at least two actions can
+        # actually run alongside each other.
+        largest_batch = max(map(len, batches), default=0)
+        if largest_batch < 2:
+            for action in self._actions:
+                run_action(action)
+            return
+
+        max_workers = min(largest_batch, os.cpu_count() or 1)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for batch in batches:
+                if len(batch) == 1:
+                    run_action(batch[0])
+                    continue
+
+                # NOTE: `Executor.map` re-raises the first exception raised by an action.
+                list(executor.map(run_action, batch))
+
     def _before_run(self) -> None:
-        for action in self._actions:
+        def before_run(action: "Action") -> None:
             try:
                 action._before_run(self)
             except SkipRun:
                 self._skip_run = True
 
+        self._run_actions(before_run)
+
     def _after_run(self) -> None:
-        for action in self._actions:
-            action._after_run(self, run_skipped=self._skip_run)
+        self._run_actions(lambda action: action._after_run(self, run_skipped=self._skip_run))
 
-            if self.is_journaling():
+        if self.is_journaling():
+            for action in self._actions:
                 self._action_results[action.__class__.__name__] = action.result
 
     def _commit_journal(self) -> None:
         if self.is_journaling():
+            # NOTE: We serialize before taking the lock, so that concurrent tools
+            # only contend with each other for the (single) write itself.
+            record = json.dumps(self._action_results, default=json_helper)
             with util.flock_append(self._journal_path) as io:  # type: ignore
-                json.dump(self._action_results, io, default=json_helper)
-                # NOTE(ww): `json.dump` doesn't do this for us.
-                io.write("\n")
+                io.write(f"{record}\n")
 
-    def run(self) -> None:
+    def run(self, *, replace_process: bool = False) -> None:
         """
         Runs the wrapped tool with the original arguments.
+
+        Args:
+            replace_process: If `True` and this tool has no actions to run and isn't
+                journaling, replace the current process with the wrapped tool (via `exec`)
+                instead of running it as a subprocess. In that case, this never returns.
         """
         self._before_run()
 
+        if replace_process and not self._actions and not self.is_journaling():
+            # NOTE: Nothing needs to happen after the wrapped tool runs, so there's no
+            # point in keeping this process around while it does.
+            os.execvpe(self.wrapped_tool(), [self.wrapped_tool(), *self.args], self._env)
+
         if not self._skip_run:
-            status = subprocess.run([self.wrapped_tool(), *self.args], env=self._env)
+            # NOTE: We don't close inherited file descriptors, since the wrapped tool
+            # may need them (e.g. for `make`'s jobserver).
+            status = subprocess.run(
+                [self.wrapped_tool(), *self.args], env=self._env, close_fds=False
+            )
             if status.returncode != 0:
                 raise BuildError(
                     f"{self.wrapped_tool()} exited with status code {status.returncode}"
@@ -189,6 +644,14 @@ class Tool:
         # since mixins that specialize `canonicalized_args` call
         # `super.canonicalized_args` to get the most recent copy.
         self._canonicalized_args = args_.copy()
+        self._invalidate_args_caches()
+
+    def _invalidate_args_caches(self) -> None:
+        """
+        Discards any cached properties that are derived from this tool's arguments.
+        """
+        for name in self._ARGS_CACHED_PROPERTIES:
+            self.__dict__.pop(name, None)
 
     @property
     def canonicalized_args(self) -> List[str]:
@@ -204,7 +667,63 @@ class Tool:
         """
         return self._cwd
 
-    @property
+    @functools.cached_property
+    def _arg_index(self) -> _ArgIndex:
+        """
+        Returns an `_ArgIndex` for this tool's canonicalized arguments.
+
+        Flags that take a value as a separate argument (e.g. `-D name`) but are missing
+        that value are ignored.
+        """
+        args = self.canonicalized_args
+        nargs = len(args)
+        index = _ArgIndex()
+
+        for idx, arg in enumerate(args):
+            match = _INDEXED_ARG_PATTERN.match(arg)
+            if match is None:
+                continue
+
+            kind = match.lastgroup
+            if kind == "stage":
+                index.stage_flags.add(arg)
+            elif kind == "ansi":
+                index.ansi = True
+            elif kind == "std":
+                index.last_std = idx
+            elif kind == "opt":
+                index.last_opt = idx
+            elif kind == "lang":
+                index.last_lang = idx
+            elif kind == "code_model":
+                index.last_code_model = idx
+            else:
+                # Everything else takes a value, either mashed (`-Dname`),
+                # after an equals (`--library=name`), or as the next argument (`-D name`).
+                value_start = match.end()
+                if value_start < len(arg) or arg.endswith("="):
+                    value = arg[value_start:]
+                elif idx + 1 < nargs:
+                    value = args[idx + 1]
+                else:
+                    continue
+
+                if kind == "define":
+                    index.defines.append((idx, value))
+                elif kind == "undefine":
+                    index.undefines[value] = idx
+                elif kind == "library_search_path":
+                    index.library_search_paths.append(value)
+                elif kind == "library_name":
+                    index.library_names.append(value)
+                elif kind == "output":
+                    index.output = value
+                else:
+                    index.long_output = value
+
+        return index
+
+    @functools.cached_property
     def inputs(self) -> List[str]:
         """
         Returns all explicit "inputs" to the tool. "Inputs" is subjectively
@@ -226,24 +745,29 @@ class Tool:
         # * Then, look for arguments that are files in the tool's current
         #   directory.
         inputs = []
-        for idx, arg in enumerate(self.canonicalized_args):
-            if arg.startswith("-") or arg.startswith("@"):
+        prev_arg = None
+        for arg in self.canonicalized_args:
+            # Annoying edge cases: most other flags that take filenames do so in
+            # -flag=filename form, but -aux-info does it without the "=".
+            # Similarly, we need to make sure not to catch an output flag's
+            # argument here.
+            consumed = prev_arg in _FILENAME_CONSUMER_FLAGS
+            prev_arg = arg
+
+            if arg.startswith(("-", "@")):
                 if arg == "-":
                     inputs.append(arg)
                 continue
 
-            candidate = Path(arg)
-            if not candidate.is_file() and not (self.cwd / candidate).is_file():
-                # NOTE(ww): pathlib's is_file returns False for device files, e.g. /dev/stdin.
-                # It would be perverse for a build system to use these, but maybe worth
-                # handling.
+            if consumed:
                 continue
 
-            # Annoying edge cases: most other flags that take filenames do so in
-            # -flag=filename form, but -aux-info does it without the "=".
-            # Similarly, we need to make sure not to catch an output flag's
-            # argument here.
-            if idx == 0 or self.canonicalized_args[idx - 1] not in ["-aux-info", "-o"]:
+            # NOTE: `os.path.join` discards `self._cwd` when `arg` is absolute,
+            # so a single `stat` covers both absolute and relative candidates.
+            # Like pathlib's `is_file`, this returns False for device files, e.g. /dev/stdin.
+            # It would be perverse for a build system to use these, but maybe worth
+            # handling.
+            if os.path.isfile(os.path.join(self._cwd, arg)):
                 inputs.append(arg)
 
         return inputs
@@ -263,15 +787,12 @@ class Tool:
             A list of `str`, each of which is an output
         """
 
-        o_flag_index = util.rindex_prefix(self.canonicalized_args, "-o")
-        if o_flag_index is None:
+        # NOTE(ww): This includes outputs like -ofoo. Gross, but valid according to GCC.
+        output = self._arg_index.output
+        if output is None:
             return []
 
-        if self.canonicalized_args[o_flag_index] == "-o":
-            return [self.canonicalized_args[o_flag_index + 1]]
-
-        # NOTE(ww): Outputs like -ofoo. Gross, but valid according to GCC.
-        return [self.canonicalized_args[o_flag_index][2:]]
+        return [output]
 
 
 class LangMixin:
@@ -281,7 +802,7 @@ class LangMixin:
     """
 
     @property
-    def lang(self: CanonicalizedArgsProtocol) -> Lang:
+    def lang(self: ArgIndexProtocol) -> Lang:
         """
         Returns:
             A `blight.enums.Lang` value representing the tool's language
@@ -290,11 +811,9 @@ class LangMixin:
             "this API might not do what you expect; see: https://github.com/trailofbits/blight/issues/43493"
         )
 
-        x_lang_map = {"c": Lang.C, "c-header": Lang.C, "c++": Lang.Cxx, "c++-header": Lang.Cxx}
-
         # First, check for `-x lang`. This overrides the language determined by
         # the frontend's binary name (e.g. `g++`).
-        x_flag_index = util.rindex_prefix(self.canonicalized_args, "-x")
+        x_flag_index = self._arg_index.last_lang
         if x_flag_index is not None:
             if self.canonicalized_args[x_flag_index] == "-x":
                 # TODO(ww): Maybe bounds check.
@@ -302,7 +821,7 @@ class LangMixin:
             else:
                 # NOTE(ww): -xc and -xc++ both work, at least on GCC.
                 x_lang = self.canonicalized_args[x_flag_index][2:]
-            return x_lang_map.get(x_lang, Lang.Unknown)
+            return _X_LANG_MAP.get(x_lang, Lang.Unknown)
 
         # No `-x lang` means that we're operating in the frontend's default mode.
         if self.__class__ == CC:
@@ -329,102 +848,36 @@ class StdMixin(LangMixin):
 
         # First, a special case: if -ansi is present, we're in
         # C89 mode for C code and C++03 mode for C++ code.
-        if "-ansi" in self.canonicalized_args:
-            if self.lang == Lang.C:
+        # NOTE: `lang` is only computed when needed (and then only once), since it
+        # logs on every access.
+        if self._arg_index.ansi:
+            lang = self.lang
+            if lang == Lang.C:
                 return Std.C89
-            elif self.lang == Lang.Cxx:
+            elif lang == Lang.Cxx:
                 return Std.Cxx03
             else:
-                logger.debug(f"-ansi passed but unknown language: {self.lang}")
+                logger.debug(f"-ansi passed but unknown language: {lang}")
                 return Std.Unknown
 
         # Experimentally, both GCC and clang respect the last -std=XXX flag passed.
         # See: https://stackoverflow.com/questions/40563269/passing-multiple-std-switches-to-g
-        std_flag_index = util.rindex_prefix(self.canonicalized_args, "-std=")
+        std_flag_index = self._arg_index.last_std
 
         # No -std=XXX flags? The tool is operating in its default standard mode,
         # which is determined by its language.
         if std_flag_index is None:
-            if self.lang == Lang.C:
+            lang = self.lang
+            if lang == Lang.C:
                 return Std.GnuUnknown
-            elif self.lang == Lang.Cxx:
+            elif lang == Lang.Cxx:
                 return Std.GnuxxUnknown
             else:
-                logger.debug(f"no -std= flag and unknown language: {self.lang}")
+                logger.debug(f"no -std= flag and unknown language: {lang}")
                 return Std.Unknown
 
         last_std_flag = self.canonicalized_args[std_flag_index]
-        std_flag_map = {
-            # C89 flags.
-            "-std=c89": Std.C89,
-            "-std=c90": Std.C89,
-            "-std=iso9899:1990": Std.C89,
-            # C94 flags.
-            "-std=iso9899:199409": Std.C94,
-            # C99 flags.
-            "-std=c99": Std.C99,
-            "-std=c9x": Std.C99,
-            "-std=iso9899:1999": Std.C99,
-            "-std=iso9899:199x": Std.C99,
-            # C11 flags.
-            "-std=c11": Std.C11,
-            "-std=c1x": Std.C11,
-            "-std=iso9899:2011": Std.C11,
-            # C17 flags.
-            "-std=c17": Std.C17,
-            "-std=c18": Std.C17,
-            "-std=iso9899:2017": Std.C17,
-            "-std=iso9899:2018": Std.C17,
-            # C20 (presumptive) flags.
-            "-std=c2x": Std.C2x,
-            # GNU89 flags.
-            "-std=gnu89": Std.Gnu89,
-            "-std=gnu90": Std.Gnu89,
-            # GNU99 flags.
-            "-std=gnu99": Std.Gnu99,
-            "-std=gnu9x": Std.Gnu99,
-            # GNU11 flags.
-            "-std=gnu11": Std.Gnu11,
-            "-std=gnu1x": Std.Gnu11,
-            # GNU17 flags.
-            "-std=gnu17": Std.Gnu17,
-            "-std=gnu18": Std.Gnu17,
-            # GNU20 (presumptive) flags.
-            "-std=gnu2x": Std.Gnu2x,
-            # C++03 flags.
-            # NOTE(ww): Both gcc and clang treat C++98 mode as C++03 mode.
-            "-std=c++98": Std.Cxx03,
-            "-std=c++03": Std.Cxx03,
-            # C++11 flags.
-            "-std=c++11": Std.Cxx11,
-            "-std=c++0x": Std.Cxx11,
-            # C++14 flags.
-            "-std=c++14": Std.Cxx14,
-            "-std=c++1y": Std.Cxx14,
-            # C++17 flags.
-            "-std=c++17": Std.Cxx17,
-            "-std=c++1z": Std.Cxx17,
-            # C++20 (presumptive) flags.
-            "-std=c++2a": Std.Cxx2a,
-            "-std=c++20": Std.Cxx2a,
-            # GNU++03 flags.
-            "-std=gnu++98": Std.Gnuxx03,
-            "-std=gnu++03": Std.Gnuxx03,
-            # GNU++11 flags.
-            "-std=gnu++11": Std.Gnuxx11,
-            "-std=gnu++0x": Std.Gnuxx11,
-            # GNU++14 flags.
-            "-std=gnu++14": Std.Gnuxx14,
-            "-std=gnu++1y": Std.Gnuxx14,
-            # GNU++17 flags.
-            "-std=gnu++17": Std.Gnuxx17,
-            "-std=gnu++1z": Std.Gnuxx17,
-            # GNU++20 (presumptive) flags.
-            "-std=gnu++2a": Std.Gnuxx2a,
-            "-std=gnu++20": Std.Gnuxx2a,
-        }
-
-        std = std_flag_map.get(last_std_flag)
+        std = _STD_FLAG_MAP.get(last_std_flag)
         if std is not None:
             return std
 
@@ -440,7 +893,7 @@ class StdMixin(LangMixin):
         elif std_name.startswith("gnu"):
             logger.debug(f"partially unrecognized gnu c std: {last_std_flag}")
             return Std.GnuUnknown
-        elif std_name.startswith("c") or std_name.startswith("iso9899"):
+        elif std_name.startswith(("c", "iso9899")):
             logger.debug(f"partially unrecognized c std: {last_std_flag}")
             return Std.CUnknown
 
@@ -454,37 +907,24 @@ class OptMixin:
     """
 
     @property
-    def opt(self: CanonicalizedArgsProtocol) -> OptLevel:
+    def opt(self: ArgIndexProtocol) -> OptLevel:
         """
         Returns:
             A `blight.enums.OptLevel` value representing the optimization level
         """
 
-        opt_flag_map = {
-            "-O0": OptLevel.O0,
-            "-O": OptLevel.O1,
-            "-O1": OptLevel.O1,
-            "-O2": OptLevel.O2,
-            "-O3": OptLevel.O3,
-            "-Ofast": OptLevel.OFast,
-            "-Os": OptLevel.OSize,
-            "-Oz": OptLevel.OSizeZ,
-            "-Og": OptLevel.ODebug,
-        }
-
-        # The last optimization flag takes precedence, so iterate over the arguments
-        # in reverse order.
-        for arg in reversed(self.canonicalized_args):
-            opt = opt_flag_map.get(arg)
+        # The last optimization flag takes precedence.
+        opt_flag_index = self._arg_index.last_opt
+        if opt_flag_index is not None:
+            arg = self.canonicalized_args[opt_flag_index]
+            opt = _OPT_FLAG_MAP.get(arg)
             if opt is not None:
                 return opt
 
-            if not arg.startswith("-O"):
-                continue
-
             # Special case: -O4 and above are currently equivalent to -O3 in
             # GCC and Clang. Identify these and map them to -O3.
-            if re.fullmatch(r"^-O[1-9]\d*$", arg):
+            level = arg[2:]
+            if level.isascii() and level.isdigit() and level[0] != "0":
                 return OptLevel.O3
 
             # Otherwise: We've found an argument that looks like -Osomething,
@@ -497,6 +937,20 @@ class OptMixin:
         return OptLevel.O0
 
 
+@functools.lru_cache(maxsize=64)
+def _split_response_file(path: str, mtime_ns: int, size: int, ino: int) -> Tuple[str, ...]:
+    # NOTE: `mtime_ns`, `size`, and `ino` only key the cache, so that a rewritten response
+    # file gets re-read. An mtime alone isn't enough, since a coarse-grained filesystem
+    # clock can give a quick rewrite the same mtime as the original.
+    # We tokenize straight from the file (with the same settings as `shlex.split`) rather
+    # than reading it into memory first, since link response files can be very large.
+    with open(path) as io:
+        lexer = shlex.shlex(io, posix=True)
+        lexer.whitespace_split = True
+        lexer.commenters = ""
+        return tuple(lexer)
+
+
 class ResponseFileMixin:
     """
     A mixin for tools that support the `@file` syntax for adding command-line arguments
@@ -506,12 +960,12 @@ class ResponseFileMixin:
     the name of this mixin.
     """
 
-    def _expand_response_file(
+    def _read_response_file(
         self, response_file: Path, working_dir: Path, level: int
-    ) -> List[str]:
+    ) -> Optional[Tuple[Tuple[str, ...], Path]]:
         if level >= RESPONSE_FILE_RECURSION_LIMIT:
             logger.debug(f"recursion limit exceeded: {response_file} in {working_dir}")
-            return []
+            return None
 
         # Non-absolute response files are resolved relative to `working_dir`, which
         # begins at the CWD initially and changes to the parent directory of the
@@ -519,21 +973,56 @@ class ResponseFileMixin:
         if not response_file.is_absolute():
             response_file = working_dir / response_file
 
-        if not response_file.is_file():
+        try:
+            response_file_stat = os.stat(response_file)
+        except OSError:
+            response_file_stat = None
+
+        if response_file_stat is None or not stat.S_ISREG(response_file_stat.st_mode):
             logger.debug(f"response file {response_file} does not exist")
             # TODO(ww): Instead of returning empty here, maybe return `@response_file`?
-            return []
+            return None
 
-        args = shlex.split(response_file.read_text())
-        response_files = [(idx, arg) for (idx, arg) in enumerate(args) if arg.startswith("@")]
-        for idx, nested_rf in response_files:
-            args = util.insert_items_at_idx(
-                args,
-                idx,
-                self._expand_response_file(
-                    Path(nested_rf[1:]), response_file.parent.resolve(), level + 1
-                ),
-            )
+        args = _split_response_file(
+            str(response_file),
+            response_file_stat.st_mtime_ns,
+            response_file_stat.st_size,
+            response_file_stat.st_ino,
+        )
+        return (args, response_file.parent)
+
+    def _expand_response_file(
+        self, response_file: Path, working_dir: Path, level: int
+    ) -> List[str]:
+        # NOTE: Nested response files are expanded depth-first, using an explicit stack
+        # of partially consumed response files (and their parent directories and levels)
+        # rather than recursion. Parent directories are only resolved once they're needed,
+        # since most response files don't nest.
+        args: List[str] = []
+        stack: List[Tuple[Iterator[str], Path, int]] = []
+        resolved_dirs: Dict[Path, Path] = {}
+
+        contents = self._read_response_file(response_file, working_dir, level)
+        if contents is not None:
+            stack.append((iter(contents[0]), contents[1], level))
+
+        while stack:
+            remaining_args, parent, level = stack[-1]
+            for arg in remaining_args:
+                if not arg.startswith("@"):
+                    args.append(arg)
+                    continue
+
+                nested_working_dir = resolved_dirs.get(parent)
+                if nested_working_dir is None:
+                    nested_working_dir = resolved_dirs[parent] = parent.resolve()
+
+                nested = self._read_response_file(Path(arg[1:]), nested_working_dir, level + 1)
+                if nested is not None:
+                    stack.append((iter(nested[0]), nested[1], level + 1))
+                    break
+            else:
+                stack.pop()
 
         return args
 
@@ -549,21 +1038,25 @@ class ResponseFileMixin:
         # with a `self: CanonicalizedArgsProtocol` hint, but that causes other problems
         # related to mypy's ability to see `_expand_response_file`.
 
-        response_files = [
-            (idx, arg)
-            for (idx, arg) in enumerate(super().canonicalized_args)  # type: ignore
-            if arg.startswith("@")
-        ]
-        expanded_args = super().canonicalized_args  # type: ignore
-        for idx, response_file in response_files:
-            expanded_args = util.insert_items_at_idx(
-                expanded_args,
-                idx,
-                self._expand_response_file(Path(response_file[1:]), self.cwd, 0),  # type: ignore
-            )
+        args: List[str] = super().canonicalized_args  # type: ignore[misc]
+
+        # NOTE: Expansion happens once per set of arguments: we hold onto our expanded
+        # list, and `Tool.args` replaces the underlying list whenever the arguments change.
+        expanded_args: Optional[List[str]] = self.__dict__.get("_expanded_canonicalized_args")
+        if args is expanded_args:
+            return args
+
+        expanded_args = []
+        for arg in args:
+            if arg.startswith("@"):
+                expanded_args.extend(
+                    self._expand_response_file(Path(arg[1:]), self.cwd, 0)  # type: ignore
+                )
+            else:
+                expanded_args.append(arg)
 
-        self._canonicalized_args = expanded_args
-        return self._canonicalized_args  # type: ignore[no-any-return]
+        self._canonicalized_args = self._expanded_canonicalized_args = expanded_args
+        return expanded_args
 
 
 class DefinesMixin:
@@ -573,7 +1066,7 @@ class DefinesMixin:
     """
 
     @property
-    def indexed_undefines(self: IndexedUndefinesProtocol) -> Dict[str, int]:
+    def indexed_undefines(self: ArgIndexProtocol) -> Dict[str, int]:
         """
         Returns a dictionary of indices for undefined macros. This is used in
         `defines` to ensure that we don't incorrectly report a subsequently undefined
@@ -582,17 +1075,7 @@ class DefinesMixin:
         Returns:
             A dict of `name: index` for each undefined macro.
         """
-        indexed_undefines = {}
-        for idx, arg in enumerate(self.canonicalized_args):
-            if not arg.startswith("-U"):
-                continue
-
-            # Both `-Uname` and `-U name` work in GCC and Clang.
-            undefine = self.canonicalized_args[idx + 1] if arg == "-U" else arg[2:]
-
-            indexed_undefines[undefine] = idx
-
-        return indexed_undefines
+        return dict(self._arg_index.undefines)
 
     @property
     def defines(self: IndexedUndefinesProtocol) -> List[Tuple[str, str]]:
@@ -603,14 +1086,9 @@ class DefinesMixin:
         Returns:
             A list of tuples of (name, value) for each effectively defined macro.
         """
+        index = self._arg_index
         defines = []
-        for idx, arg in enumerate(self.canonicalized_args):
-            if not arg.startswith("-D"):
-                continue
-
-            # Both `-Dname[=value]` and `-D name[=value]` work in GCC and Clang.
-            define = self.canonicalized_args[idx + 1] if arg == "-D" else arg[2:]
-
+        for idx, define in index.defines:
             components = define.split("=", 1)
             name = components[0]
 
@@ -621,7 +1099,7 @@ class DefinesMixin:
 
             # Is this macro subsequently undefined? If so, don't include it in
             # the defines list.
-            if self.indexed_undefines.get(name, -1) > idx:
+            if index.undefines.get(name, -1) > idx:
                 continue
 
             defines.append((name, value))
@@ -636,29 +1114,20 @@ class CodeModelMixin:
     """
 
     @property
-    def code_model(self: CanonicalizedArgsProtocol) -> CodeModel:
+    def code_model(self: ArgIndexProtocol) -> CodeModel:
         """
         Returns:
             A `blight.enums.CodeModel` value representing the tool's code model
         """
-        code_model_map = {
-            "-mcmodel=small": CodeModel.Small,
-            "-mcmodel=medlow": CodeModel.Small,
-            "-mcmodel=medium": CodeModel.Medium,
-            "-mcmodel=medany": CodeModel.Medium,
-            "-mcmodel=large": CodeModel.Large,
-            "-mcmodel=kernel": CodeModel.Kernel,
-        }
-
         # NOTE(ww): Both Clang and GCC seem to default to the "small" code model
         # when none is specified, at least on x86-64. But this might not be consistent
         # across architectures, so maybe we should return `CodeModel.Unknown` here
         # instead.
-        code_model = util.ritem_prefix(self.canonicalized_args, "-mcmodel=")
-        if code_model is None:
+        code_model_index = self._arg_index.last_code_model
+        if code_model_index is None:
             return CodeModel.Small
 
-        return code_model_map.get(code_model, CodeModel.Unknown)
+        return _CODE_MODEL_MAP.get(self.canonicalized_args[code_model_index], CodeModel.Unknown)
 
 
 class LinkSearchMixin:
@@ -667,8 +1136,8 @@ class LinkSearchMixin:
     library paths and libraries, respectively.
     """
 
-    @property
-    def explicit_library_search_paths(self: CanonicalizedArgsProtocol) -> List[Path]:
+    @functools.cached_property
+    def explicit_library_search_paths(self: ArgIndexProtocol) -> List[Path]:
         """
         Returns a list of library search paths that are explicitly specified in
         the tool's invocation. Semantically, these paths are (normally) given
@@ -678,17 +1147,20 @@ class LinkSearchMixin:
         which is tool-specific and host-dependent.
         """
 
-        shorts = util.collect_option_values(self.canonicalized_args, "-L")
-        longs = util.collect_option_values(
-            self.canonicalized_args, "--library-path", style=util.OptionValueStyle.EqualOrSpace
-        )
-
-        sorted_values = sorted(itertools.chain(shorts, longs), key=lambda v: v[0])
+        # NOTE: Resolving a path costs a syscall per component, and builds frequently
+        # repeat the same search paths. Resolve each distinct path only once.
+        resolved: Dict[str, Path] = {}
+        paths = []
+        for value in self._arg_index.library_search_paths:
+            path = resolved.get(value)
+            if path is None:
+                path = resolved[value] = (self.cwd / value).resolve()
+            paths.append(path)
 
-        return [(self.cwd / value[1]).resolve() for value in sorted_values]
+        return paths
 
     @property
-    def library_names(self: CanonicalizedArgsProtocol) -> List[str]:
+    def library_names(self: ArgIndexProtocol) -> List[str]:
         """
         Returns a list of library names (without suffixes) for libraries that
         are explicitly specified in the tool's invocation.
@@ -697,14 +1169,7 @@ class LinkSearchMixin:
         listed as "inputs" to the tool rather than as linkage specifications.
         """
 
-        shorts = util.collect_option_values(self.canonicalized_args, "-l")
-        longs = util.collect_option_values(
-            self.canonicalized_args, "--library", style=util.OptionValueStyle.EqualOrSpace
-        )
-
-        sorted_values = sorted(itertools.chain(shorts, longs), key=lambda v: v[0])
-
-        return [f"lib{value[1]}" for value in sorted_values]
+        return [f"lib{value}" for value in self._arg_index.library_names]
 
 
 # NOTE(ww): The funny mixin order here (`ResponseFileMixin` before `Tool`) and elsewhere
@@ -727,51 +1192,20 @@ class CompilerTool(
 
         # #40 and #41: These should be handled in an overridden implementation
         # of `canonicalized_args`.
-        injection_vars = COMPILER_FLAG_INJECTION_VARIABLES & self._env.keys()
+        injection_vars = {var for var in COMPILER_FLAG_INJECTION_VARIABLES if var in self._env}
         if injection_vars:
             logger.warning(f"not tracking compiler's own instrumentation: {injection_vars}")
 
-    @property
+    @functools.cached_property
     def family(self) -> CompilerFamily:
         """
         Returns:
             A `blight.enums.CompilerFamily` value representing the "family" of compilers
             that this tool belongs to.
         """
+        return _compiler_family(self.wrapped_tool())
 
-        # NOTE(ww): Both GCC and Clang support -### as an alias for -v, but
-        # with additional guarantees around argument quoting. Do other families support it?
-
-        result = subprocess.run([self.wrapped_tool(), "-###"], capture_output=True)
-
-        # If the command exited with an error, we're likely dealing with a frontend
-        # that doesn't understand `-###`.
-        if result.returncode != 0:
-            logger.warning("compiler fingerprint failed: frontend didn't recognize -###?")
-            # ...but even still, we can infer a bit from the error message.
-            if b"tcc: error" in result.stderr:
-                return CompilerFamily.Tcc
-            else:
-                return CompilerFamily.Unknown
-
-        # We expect the relevant parts of `-###` on stderr. The lack of any output
-        # again suggests that the frontend doesn't understand the flag.
-        if not result.stderr:
-            logger.warning("compiler fingerprint failed: frontend didn't produce output for -###?")
-            return CompilerFamily.Unknown
-
-        # Finally, we do some silly substring checks.
-        # TODO(ww): Better heuristics here?
-        if b"Apple clang version" in result.stderr:
-            return CompilerFamily.AppleLlvm
-        elif b"clang version" in result.stderr:
-            return CompilerFamily.MainlineLlvm
-        elif b"gcc version" in result.stderr:
-            return CompilerFamily.Gcc
-        else:
-            return CompilerFamily.Unknown
-
-    @property
+    @functools.cached_property
     def stage(self) -> CompilerStage:
         """
         Returns:
@@ -786,18 +1220,9 @@ class CompilerTool(
         if len(self.canonicalized_args) == 0:
             return CompilerStage.Unknown
 
-        stage_flag_map = {
-            # NOTE(ww): See the TODO in CompilerStage.
-            "-v": CompilerStage.Unknown,
-            "-###": CompilerStage.Unknown,
-            "-E": CompilerStage.Preprocess,
-            "-fsyntax-only": CompilerStage.SyntaxOnly,
-            "-S": CompilerStage.Assemble,
-            "-c": CompilerStage.CompileObject,
-        }
-
-        for flag, stage in stage_flag_map.items():
-            if flag in self.canonicalized_args:
+        stage_flags = self._arg_index.stage_flags
+        for flag, stage in _STAGE_FLAG_MAP.items():
+            if flag in stage_flags:
                 return stage
 
         # TODO(ww): Handle header precompilation here. GCC doesn't seem to
@@ -808,7 +1233,7 @@ class CompilerTool(
         # "run all stages", so we do too.
         return CompilerStage.AllStages
 
-    @property
+    @functools.cached_property
     def outputs(self) -> List[str]:
         """
         Specializes `Tool.outputs` for compiler tools.
@@ -819,18 +1244,18 @@ class CompilerTool(
 
         # Without an explicit `-o outfile`, the default output name(s)
         # depends on the compiler's stage.
-        if self.stage == CompilerStage.Preprocess:
-            # NOTE(ww): The preprocessor stage emits to stdout, but returning "-" as
-            # a sentinel for that is very meh. If only Python had Rust-style enums.
-            return ["-"]
-        elif self.stage == CompilerStage.Assemble:
+        stage = self.stage
+        suffix = _STAGE_OUTPUT_SUFFIX_MAP.get(stage)
+        if suffix is not None:
             # NOTE(ww): Outputs are created relative to the current working directory,
             # not relative to their input. We return them as relative paths to
             # indicate this (maybe we should just fully resolve them?)
-            return [Path(input_).with_suffix(".s").name for input_ in self.inputs]
-        elif self.stage == CompilerStage.CompileObject:
-            return [Path(input_).with_suffix(".o").name for input_ in self.inputs]
-        elif self.stage == CompilerStage.AllStages:
+            return [_rename_suffix(input_, suffix) for input_ in self.inputs]
+        elif stage == CompilerStage.Preprocess:
+            # NOTE(ww): The preprocessor stage emits to stdout, but returning "-" as
+            # a sentinel for that is very meh. If only Python had Rust-style enums.
+            return ["-"]
+        elif stage == CompilerStage.AllStages:
             # NOTE(ww): This will be wrong when we're doing header precompilation;
             # see the TODO in `stage`.
             return ["a.out"]
@@ -838,13 +1263,12 @@ class CompilerTool(
             return []
 
     def asdict(self) -> Dict[str, Any]:
-        return {
-            **super().asdict(),
-            "lang": self.lang.name,
-            "std": self.std.name,
-            "stage": self.stage.name,
-            "opt": self.opt.name,
-        }
+        d = super().asdict()
+        d["lang"] = self.lang.name
+        d["std"] = self.std.name
+        d["stage"] = self.stage.name
+        d["opt"] = self.opt.name
+        return d
 
 
 class CC(CompilerTool):
@@ -874,7 +1298,10 @@ class CPP(Tool, StdMixin, DefinesMixin):
         return f"<CPP {self.wrapped_tool()} {self.lang} {self.std}>"
 
     def asdict(self) -> Dict[str, Any]:
-        return {**super().asdict(), "lang": self.lang.name, "std": self.std.name}
+        d = super().asdict()
+        d["lang"] = self.lang.name
+        d["std"] = self.std.name
+        return d
 
 
 class LD(LinkSearchMixin, ResponseFileMixin, Tool):
@@ -882,7 +1309,7 @@ class LD(LinkSearchMixin, ResponseFileMixin, Tool):
     Represents the linker.
     """
 
-    @property
+    @functools.cached_property
     def outputs(self) -> List[str]:
         """
         Specializes `Tool.outputs` for the linker.
@@ -893,17 +1320,12 @@ class LD(LinkSearchMixin, ResponseFileMixin, Tool):
             return outputs
 
         # The GNU linker additionally supports --output=OUTFILE and
-        # --output OUTFILE. Handle them here.
-        output_flag_index = util.rindex_prefix(self.canonicalized_args, "--output")
-        if output_flag_index is None:
+        # --output OUTFILE. The argument index handles both forms for us.
+        output = self._arg_index.long_output
+        if output is None:
             return ["a.out"]
 
-        # Split option form.
-        if self.canonicalized_args[output_flag_index] == "--output":
-            return [self.canonicalized_args[output_flag_index + 1]]
-
-        # Assignment form.
-        return [self.canonicalized_args[output_flag_index].split("=")[1]]
+        return [output]
 
     def __repr__(self) -> str:
         return f"<LD {self.wrapped_tool()}>"
@@ -923,7 +1345,7 @@ class AR(ResponseFileMixin, Tool):
     Represents the archiver.
     """
 
-    @property
+    @functools.cached_property
     def outputs(self) -> List[str]:
         """
         Specializes `Tool.outputs` for the archiver.
@@ -942,11 +1364,7 @@ class AR(ResponseFileMixin, Tool):
         # for the first argument that looks like an archive output
         # (since the archiver only ever produces one output at a time).
         for arg in self.canonicalized_args:
-            if arg.startswith("-"):
-                continue
-
-            maybe_archive_suffixes = Path(arg).suffixes
-            if len(maybe_archive_suffixes) > 0 and maybe_archive_suffixes[0] == ".a":
+            if not arg.startswith("-") and arg.endswith(_ARCHIVE_SUFFIXES):
                 return [arg]
 
         logger.debug("couldn't infer output for archiver")
@@ -970,9 +1388,13 @@ class INSTALL(Tool):
     Represents the install tool.
     """
 
-    def _install_parser(self) -> util.ArgumentParser:
+    # NOTE: The parser is built once and shared by every instance; `argparse` parsers
+    # don't hold any state between calls to `parse_known_args`.
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _install_parser(cls) -> util.ArgumentParser:
         parser = util.ArgumentParser(
-            prog=self.build_tool().value, add_help=False, allow_abbrev=False
+            prog=cls.build_tool().value, add_help=False, allow_abbrev=False
         )
 
         def add_flag(short: str, dest: str, **kwargs: Any) -> None:
@@ -995,16 +1417,33 @@ class INSTALL(Tool):
 
         return parser
 
+    _ARGS_CACHED_PROPERTIES = Tool._ARGS_CACHED_PROPERTIES + ("_parsed",)
+
     def __init__(self, args: List[str]) -> None:
         super().__init__(args)
         self._parser = self._install_parser()
 
+    @functools.cached_property
+    def _parsed(self) -> Tuple[argparse.Namespace, List[str]]:
+        """
+        Returns the parsed (known and unknown) arguments for this `install` invocation.
+
+        Parsing is deferred until something actually asks about the invocation's
+        semantics, since many uses of a tool (like logging it) never do.
+        """
         try:
-            (self._matches, self._unknown) = self._parser.parse_known_args(args)
+            return self._parser.parse_known_args(self.args)
         except ValueError as e:
             logger.error(f"argparse error: {e}")
-            self._matches = self._parser.default_namespace()
-            self._unknown = args
+            return (self._parser.default_namespace(), self.args)
+
+    @property
+    def _matches(self) -> argparse.Namespace:
+        return self._parsed[0]
+
+    @property
+    def _unknown(self) -> List[str]:
+        return self._parsed[1]
 
     @property
     def directory_mode(self) -> bool:
@@ -1014,56 +1453,53 @@ class INSTALL(Tool):
         """
         return self._matches.directory_mode  # type: ignore[no-any-return]
 
-    @property
-    def inputs(self) -> List[str]:
+    def _inputs_and_outputs(self) -> Tuple[List[str], List[str]]:
         """
-        Specializes `Tool.inputs` for the install tool.
+        Returns this `install` invocation's inputs and outputs, which share most
+        of their logic (and a filesystem check), so we compute them together.
+
+        The result isn't cached, since the destination directory's existence
+        can change over the tool's lifetime (e.g. once `run` creates it).
         """
+        trailing: List[str] = self._matches.trailing
 
         # Directory mode: all positionals are new directories, i.e. outputs.
         if self.directory_mode:
-            return []
+            return ([], trailing)
 
         # `install` requires at least two positionals outside of directory mode,
         # so this probably indicates an unknown GNUism like `--help`.
-        if len(self._matches.trailing) < 2:
+        if len(trailing) < 2:
             logger.debug(f"install called with no positionals (hint: unknown args: {self._unknown}")
-            return []
+            return ([], [])
 
         # Otherwise, we're either installing one file to another or we're
         # installing multiple files to a directory. Test the last positional
         # to determine which mode we're in.
-        maybe_dir = self._cwd / self._matches.trailing[-1]
-        if maybe_dir.is_dir():
-            return self._matches.trailing[0:-1]  # type: ignore[no-any-return]
+        # NOTE: `os.path.join` discards the CWD for us if the destination is absolute.
+        if os.path.isdir(os.path.join(self._cwd, trailing[-1])):
+            # If we're installing multiple files to a destination directory,
+            # then our outputs are every input, under the destination.
+            dest_dir = self._cwd / trailing[-1]
+            inputs = trailing[0:-1]
+            return (inputs, [str(dest_dir / Path(input_).name) for input_ in inputs])
         else:
-            return [self._matches.trailing[0]]
+            # Otherwise, our output is a single file.
+            return ([trailing[0]], [trailing[-1]])
+
+    @property
+    def inputs(self) -> List[str]:
+        """
+        Specializes `Tool.inputs` for the install tool.
+        """
+        return self._inputs_and_outputs()[0]
 
     @property
     def outputs(self) -> List[str]:
         """
         Specializes `Tool.outputs` for the install tool.
         """
-
-        # Directory mode: treat created directories as outputs.
-        if self.directory_mode:
-            return self._matches.trailing  # type: ignore[no-any-return]
-
-        # `install` requires at least two positionals outside of directory mode,
-        # so this probably indicates an unknown GNUism like `--help`.
-        if len(self._matches.trailing) < 2:
-            logger.debug(f"install called with no positionals (hint: unknown args: {self._unknown}")
-            return []
-
-        # If we're installing multiple files to a destination directory,
-        # then our outputs are every input, under the destination.
-        # Otherwise, our output is a single file.
-        maybe_dir = self._cwd / self._matches.trailing[-1]
-        if maybe_dir.is_dir():
-            inputs = [Path(input_) for input_ in self._matches.trailing[0:-1]]
-            return [str(maybe_dir / input_.name) for input_ in inputs]
-        else:
-            return [self._matches.trailing[-1]]
+        return self._inputs_and_outputs()[1]
 
     def __repr__(self) -> str:
         return f"<INSTALL {self.wrapped_tool()}>"
@@ -8,7 +8,9 @@ import argparse
 import contextlib
 import enum
 import fcntl
+import functools
 import os
+import re
 import shlex
 import sys
 from pathlib import Path
@@ -20,6 +22,12 @@ from blight.exceptions import BlightError
 
 SWIZZLE_SENTINEL = "@blight-swizzle@"
 
+_SHELL_SPECIAL_PATTERN = re.compile(r"[^\x20-\x7e\t\n\r]|[\"'\\]")
+"""
+Matches any character that could make `str.split` disagree with `shlex.split`:
+quotes, backslashes, and anything outside of printable ASCII and `shlex`'s whitespace.
+"""
+
 
 @enum.unique
 class OptionValueStyle(enum.Enum):
@@ -109,29 +117,51 @@ def collect_option_values(
 
     # TODO(ww): There are a lot of error cases here. They should be thought out more.
 
+    # NOTE: The style is fixed for the whole search, so decide what it permits up front.
+    permits_space = style.permits_space()
+    permits_mash = style.permits_mash()
+    permits_equal = style.permits_equal()
+    option_len = len(option)
+
     values: list[tuple[int, str]] = []
     for idx, arg in enumerate(args):
         if not arg.startswith(option):
             continue
 
         is_exact = arg == option
-        if is_exact and style.permits_space():
+        if is_exact and permits_space:
             # -o foo is the only style that make sense here.
             values.append((idx, args[idx + 1]))
         elif not is_exact:
             # We have -oSOMETHING, where SOMETHING might be:
             # * A "mash", like `-Dfoo`
             # * An equals, like `-D=foo`
-            if style.permits_mash():
-                # NOTE(ww): Assignment to work around black's confusing formatting.
-                suff = len(option)
-                values.append((idx, arg[suff:]))
-            elif style.permits_equal():
+            if permits_mash:
+                values.append((idx, arg[option_len:]))
+            elif permits_equal:
                 values.append((idx, arg.split("=", 1)[1]))
 
     return values
 
 
+def shell_split(value: str) -> list[str]:
+    """
+    Splits `value` into shell words, exactly like `shlex.split`.
+
+    Args:
+        value (str): The string to split
+
+    Returns:
+        A list of each word in `value`
+    """
+
+    # NOTE: Most flag strings contain no quoting at all, in which case a plain
+    # whitespace split is equivalent to (and much faster than) a full `shlex` lexer.
+    if _SHELL_SPECIAL_PATTERN.search(value) is None:
+        return value.split()
+    return shlex.split(value)
+
+
 def rindex(items: Sequence[Any], needle: Any) -> int | None:
     """
     Args:
@@ -141,10 +171,12 @@ def rindex(items: Sequence[Any], needle: Any) -> int | None:
     Returns:
         The rightmost index of `needle`, or `None`.
     """
-    for idx, item in enumerate(reversed(items)):
-        if item == needle:
-            return len(items) - idx - 1
-    return None
+    # NOTE: Searching a reversed copy keeps the comparison loop inside the C
+    # implementation of `index`, which is much faster than iterating in Python.
+    try:
+        return len(items) - items[::-1].index(needle) - 1
+    except ValueError:
+        return None
 
 
 def rindex_prefix(items: Sequence[str], prefix: str) -> int | None:
@@ -190,18 +222,11 @@ def insert_items_at_idx(parent_items: Sequence[Any], idx: int, items: Sequence[A
         A new list containing both the parent and inserted items
     """
 
-    def _insert_items_at_idx(
-        parent_items: Sequence[Any], idx: int, items: Sequence[Any]
-    ) -> Iterator[Any]:
-        for pidx, item in enumerate(parent_items):
-            if pidx != idx:
-                print(item)
-                yield item
-            else:
-                for item in items:
-                    yield item
+    # NOTE: The item at `idx` is replaced, and an out-of-range `idx` inserts nothing.
+    if not 0 <= idx < len(parent_items):
+        return list(parent_items)
 
-    return list(_insert_items_at_idx(parent_items, idx, items))
+    return [*parent_items[:idx], *items, *parent_items[idx + 1 :]]
 
 
 @contextlib.contextmanager
@@ -221,6 +246,10 @@ def flock_append(filename: os.PathLike) -> Iterator[IO]:
             fcntl.flock(io, fcntl.LOCK_EX)
             yield io
         finally:
+            # NOTE: Flush while we still hold the lock; otherwise, our buffered writes
+            # land only when the file is closed, after other processes may have
+            # acquired the lock and begun writing themselves.
+            io.flush()
             fcntl.flock(io, fcntl.LOCK_UN)
 
 
@@ -228,8 +257,15 @@ def unswizzled_path() -> str:
     """
     Returns a version of the current `$PATH` with any blight shim paths removed.
     """
-    paths = os.getenv("PATH", "").split(os.pathsep)
-    paths = [p for p in paths if not Path(p).name.endswith(SWIZZLE_SENTINEL)]
+    return _unswizzle_path(os.environ.get("PATH", ""))
+
+
+@functools.lru_cache(maxsize=8)
+def _unswizzle_path(path: str) -> str:
+    # NOTE: A shim directory's name ends with the sentinel, so checking the end of
+    # each entry (ignoring trailing slashes) avoids building a `Path` for every entry.
+    paths = path.split(os.pathsep)
+    paths = [p for p in paths if not p.rstrip(os.sep).endswith(SWIZZLE_SENTINEL)]
 
     return os.pathsep.join(paths)
 
@@ -266,32 +302,44 @@ def load_actions() -> list[Action]:
     Returns:
         A list of `blight.action.Action`s.
     """
-    import blight.actions
-
-    action_names = os.getenv("BLIGHT_ACTIONS")
+    action_names = os.environ.get("BLIGHT_ACTIONS")
     if not action_names:
         return []
 
-    seen = set()
-    actions = []
-    for action_name in action_names.split(":"):
-        if action_name in seen:
-            continue
-        seen.add(action_name)
+    # NOTE: Resolving action classes and parsing their configurations is the expensive
+    # part, so it's cached on the environment that it depends on. Each call still gets
+    # fresh action instances, since actions carry per-run state.
+    names = tuple(dict.fromkeys(action_names.split(":")))
+    configs_raw = tuple(os.environ.get(f"BLIGHT_ACTION_{name.upper()}") for name in names)
+
+    return [
+        action_class(dict(action_config))
+        for (action_class, action_config) in _load_action_specs(names, configs_raw)
+    ]
+
+
+@functools.lru_cache(maxsize=8)
+def _load_action_specs(
+    names: tuple[str, ...], configs_raw: tuple[str | None, ...]
+) -> list[tuple[type[Action], dict[str, str]]]:
+    import blight.actions
 
-        action_class = getattr(blight.actions, action_name, None)
-        if action_class is None:
+    specs = []
+    for action_name, action_config_raw in zip(names, configs_raw):
+        # NOTE: Only the actions that `blight.actions` exports are loadable; a bare
+        # `getattr` would also find its submodules (e.g. `record`).
+        if action_name not in blight.actions.__all__:
             raise BlightError(f"Unknown action: {action_name}")
+        action_class = getattr(blight.actions, action_name)
 
-        action_config_raw = os.getenv(f"BLIGHT_ACTION_{action_name.upper()}", None)
         if action_config_raw is not None:
-            action_config = shlex.split(action_config_raw)
+            action_config = shell_split(action_config_raw)
             action_config = dict(c.split("=", 1) for c in action_config)
         else:
             action_config = {}
 
-        actions.append(action_class(action_config))
-    return actions
+        specs.append((action_class, action_config))
+    return specs
 
 
 def json_helper(value: Any) -> Any:
@@ -324,5 +372,11 @@ class ArgumentParser(argparse.ArgumentParser):
         Returns a default `argparse.Namespace`, suitable for contexts where
         argument parsing fails completely.
         """
-        defaults = {action.dest: self.get_default(action.dest) for action in self._actions}
+        # NOTE: This is equivalent to calling `get_default` for each action's `dest`, but
+        # without `get_default`'s own scan over every action: the leftmost non-`None`
+        # action default wins, falling back to any parser-level default.
+        defaults = {action.dest: self._defaults.get(action.dest) for action in self._actions}
+        for action in reversed(self._actions):
+            if action.default is not None:
+                defaults[action.dest] = action.default
         return argparse.Namespace(**defaults)
@@ -1,6 +1,7 @@
 import shlex
 
 from blight.actions import CCForCXX
+from blight.enums import Lang
 from blight.tool import CC
 
 
@@ -11,6 +12,7 @@ def test_cc_for_cxx():
     cc_for_cxx.before_run(cc)
 
     assert cc.args == shlex.split("-x c++ -std=c++17 foo.cpp")
+    assert cc.lang == Lang.Cxx
 
 
 def test_cc_for_cxx_does_not_inject():
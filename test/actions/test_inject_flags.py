@@ -61,3 +61,25 @@ def test_inject_flags_unknown_lang():
     inject_flags.before_run(cxx)
 
     assert cxx.args == shlex.split("-x -unknownlanguage")
+
+
+def test_inject_flags_stage_after_injection():
+    inject_flags = InjectFlags({"CFLAGS": "-c", "CFLAGS_LINKER": "-c-linker-flags"})
+    cc = CC(["foo.c"])
+
+    inject_flags.before_run(cc)
+
+    assert cc.args == ["foo.c", "-c"]
+
+
+def test_inject_flags_split_once(monkeypatch):
+    inject_flags = InjectFlags({"CFLAGS": "-more -flags", "CPPFLAGS": "-foo"})
+    cc1 = CC(["-fake"])
+    cc2 = CC(["-c"])
+
+    inject_flags.before_run(cc1)
+    monkeypatch.setitem(inject_flags._config, "CFLAGS", "-changed")
+    inject_flags.before_run(cc2)
+
+    assert cc1.args == ["-fake", "-more", "-flags", "-foo"]
+    assert cc2.args == ["-c", "-more", "-flags", "-foo"]
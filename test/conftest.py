@@ -2,6 +2,8 @@ import shutil
 
 import pytest
 
+from blight import tool
+
 
 @pytest.fixture(autouse=True)
 def blight_env(monkeypatch):
@@ -13,3 +15,16 @@ def blight_env(monkeypatch):
     monkeypatch.setenv("BLIGHT_WRAPPED_AR", shutil.which("ar"))
     monkeypatch.setenv("BLIGHT_WRAPPED_STRIP", shutil.which("strip"))
     monkeypatch.setenv("BLIGHT_WRAPPED_INSTALL", shutil.which("install"))
+    monkeypatch.delenv("BLIGHT_CACHE_DIR", raising=False)
+    monkeypatch.delenv("BLIGHT_ACTIONS_PARALLEL", raising=False)
+
+
+@pytest.fixture(autouse=True)
+def blight_caches():
+    # Compiler fingerprints and response files are memoized for the lifetime of the process,
+    # so each test needs to start from a clean slate.
+    tool._fingerprint.cache_clear()
+    tool._split_response_file.cache_clear()
+    yield
+    tool._fingerprint.cache_clear()
+    tool._split_response_file.cache_clear()
@@ -2,6 +2,7 @@ import json
 import os
 import shlex
 import shutil
+import subprocess
 import sys
 from pathlib import Path
 
@@ -16,6 +17,14 @@ needs_clang = pytest.mark.skipif(not shutil.which("clang"), reason="test require
 needs_gcc = pytest.mark.skipif(not shutil.which("gcc"), reason="test requires gcc")
 
 
+def _stub_subprocess(result):
+    return pretend.stub(
+        run=pretend.call_recorder(lambda args, **kw: result),
+        DEVNULL=subprocess.DEVNULL,
+        PIPE=subprocess.PIPE,
+    )
+
+
 def test_tool_doesnt_instantiate():
     with pytest.raises(NotImplementedError):
         tool.Tool([])
@@ -41,20 +50,29 @@ def test_compilertool_env_warns_on_injection(monkeypatch):
 @needs_clang
 def test_compilertool_family_clang(monkeypatch):
     monkeypatch.setenv("BLIGHT_WRAPPED_CC", "clang")
+    # Force a real fingerprint, rather than a guess from the frontend's name.
+    monkeypatch.setattr(tool, "_guess_family", lambda wrapped_tool: None)
+    run_fingerprint = pretend.call_recorder(tool._run_fingerprint)
+    monkeypatch.setattr(tool, "_run_fingerprint", run_fingerprint)
     cc = tool.CC([])
 
     # The host `clang` can be either one of these, depending on the OS or
     # user's configuration.
     assert cc.family in [CompilerFamily.AppleLlvm, CompilerFamily.MainlineLlvm]
+    assert len(run_fingerprint.calls) == 1
 
 
 @needs_gcc
 @pytest.mark.skipif(sys.platform.startswith("darwin"), reason="clang is aliased as gcc on macOS")
 def test_compilertool_family_gcc(monkeypatch):
     monkeypatch.setenv("BLIGHT_WRAPPED_CC", "gcc")
+    run_fingerprint = pretend.call_recorder(tool._run_fingerprint)
+    monkeypatch.setattr(tool, "_run_fingerprint", run_fingerprint)
     cc = tool.CC([])
 
+    # `gcc` is never guessed from its name, so this is always a real fingerprint.
     assert cc.family == CompilerFamily.Gcc
+    assert len(run_fingerprint.calls) == 1
 
 
 @pytest.mark.parametrize(
@@ -72,7 +90,7 @@ def test_compilertool_family(monkeypatch, stderr, family):
     monkeypatch.setattr(tool, "logger", logger)
 
     result = pretend.stub(returncode=0, stderr=stderr)
-    subprocess = pretend.stub(run=pretend.call_recorder(lambda args, **kw: result))
+    subprocess = _stub_subprocess(result)
     monkeypatch.setattr(tool, "subprocess", subprocess)
 
     cc = tool.CC([])
@@ -91,7 +109,7 @@ def test_compilertool_family_tcc(monkeypatch):
     monkeypatch.setattr(tool, "logger", logger)
 
     result = pretend.stub(returncode=1, stderr=b"tcc: error: invalid option -- '-###'")
-    subprocess = pretend.stub(run=pretend.call_recorder(lambda args, **kw: result))
+    subprocess = _stub_subprocess(result)
     monkeypatch.setattr(tool, "subprocess", subprocess)
 
     cc = tool.CC([])
@@ -106,7 +124,7 @@ def test_compilertool_family_fingerprint_fails(monkeypatch):
     monkeypatch.setattr(tool, "logger", logger)
 
     result = pretend.stub(returncode=1, stderr=b"")
-    subprocess = pretend.stub(run=pretend.call_recorder(lambda args, **kw: result))
+    subprocess = _stub_subprocess(result)
     monkeypatch.setattr(tool, "subprocess", subprocess)
 
     cc = tool.CC([])
@@ -116,18 +134,213 @@ def test_compilertool_family_fingerprint_fails(monkeypatch):
     ]
 
 
+@pytest.mark.parametrize(
+    ("wrapped", "family"),
+    [
+        ("clang", CompilerFamily.MainlineLlvm),
+        ("clang-17.0.1", CompilerFamily.MainlineLlvm),
+        ("/usr/local/bin/clang++-17", CompilerFamily.MainlineLlvm),
+        ("tcc", CompilerFamily.Tcc),
+    ],
+)
+def test_compilertool_family_from_name(monkeypatch, wrapped, family):
+    monkeypatch.setattr(sys, "platform", "linux")
+    monkeypatch.setenv("BLIGHT_WRAPPED_CC", wrapped)
+
+    subprocess = _stub_subprocess(None)
+    monkeypatch.setattr(tool, "subprocess", subprocess)
+
+    assert tool.CC([]).family == family
+    assert subprocess.run.calls == []
+
+
+@pytest.mark.parametrize(
+    "wrapped",
+    ["cc", "/usr/bin/c++", "gcc", "/usr/bin/gcc-13", "g++-9.4", "gcc-wrapper", "clang-tidy"],
+)
+def test_compilertool_family_from_name_ambiguous(monkeypatch, wrapped):
+    monkeypatch.setattr(sys, "platform", "linux")
+    monkeypatch.setenv("BLIGHT_WRAPPED_CC", wrapped)
+
+    result = pretend.stub(returncode=0, stderr=b"gcc version 9.4.0")
+    subprocess = _stub_subprocess(result)
+    monkeypatch.setattr(tool, "subprocess", subprocess)
+
+    assert tool.CC([]).family == CompilerFamily.Gcc
+    assert len(subprocess.run.calls) == 1
+
+
+def test_compilertool_family_from_name_darwin(monkeypatch):
+    monkeypatch.setattr(sys, "platform", "darwin")
+    monkeypatch.setenv("BLIGHT_WRAPPED_CC", "clang")
+
+    result = pretend.stub(returncode=0, stderr=b"Apple clang version 13.1.6")
+    subprocess = _stub_subprocess(result)
+    monkeypatch.setattr(tool, "subprocess", subprocess)
+
+    assert tool.CC([]).family == CompilerFamily.AppleLlvm
+    assert len(subprocess.run.calls) == 1
+
+
+def test_compilertool_family_cached(monkeypatch):
+    result = pretend.stub(returncode=0, stderr=b"gcc version 9.4.0")
+    subprocess = _stub_subprocess(result)
+    monkeypatch.setattr(tool, "subprocess", subprocess)
+
+    cc = tool.CC([])
+    assert cc.family == CompilerFamily.Gcc
+    assert cc.family == CompilerFamily.Gcc
+    assert tool.CC(["-c"]).family == CompilerFamily.Gcc
+    assert len(subprocess.run.calls) == 1
+
+
+def test_compilertool_family_cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv("BLIGHT_CACHE_DIR", str(tmp_path / "cache"))
+
+    result = pretend.stub(returncode=0, stderr=b"gcc version 9.4.0")
+    subprocess = _stub_subprocess(result)
+    monkeypatch.setattr(tool, "subprocess", subprocess)
+
+    assert tool.CC([]).family == CompilerFamily.Gcc
+    assert len(subprocess.run.calls) == 1
+
+    cache_file = tmp_path / "cache" / tool.FAMILY_CACHE_FILENAME
+    record = json.loads(cache_file.read_text())
+    cc_stat = os.stat(shutil.which("cc"))
+    assert record["path"] == shutil.which("cc")
+    assert (record["mtime_ns"], record["size"], record["ino"]) == (
+        cc_stat.st_mtime_ns,
+        cc_stat.st_size,
+        cc_stat.st_ino,
+    )
+    assert record["family"] == "Gcc"
+
+    # A fresh process (i.e., an empty in-memory cache) picks up the persisted fingerprint.
+    tool._fingerprint.cache_clear()
+    assert tool.CC([]).family == CompilerFamily.Gcc
+    assert len(subprocess.run.calls) == 1
+
+
+@pytest.mark.parametrize("cache_dir", ["not-a-dir", "not-a-dir/cache"])
+def test_compilertool_family_cache_dir_unusable(monkeypatch, tmp_path, cache_dir):
+    # NOTE: A regular file stands in for a non-writable cache directory, since
+    # permission bits don't stop root.
+    (tmp_path / "not-a-dir").write_text("")
+    monkeypatch.setenv("BLIGHT_CACHE_DIR", str(tmp_path / cache_dir))
+
+    result = pretend.stub(returncode=0, stderr=b"gcc version 9.4.0")
+    subprocess = _stub_subprocess(result)
+    monkeypatch.setattr(tool, "subprocess", subprocess)
+
+    assert tool.CC([]).family == CompilerFamily.Gcc
+    assert len(subprocess.run.calls) == 1
+
+
+def test_compilertool_family_cache_file_unreadable(monkeypatch, tmp_path):
+    monkeypatch.setenv("BLIGHT_CACHE_DIR", str(tmp_path))
+    (tmp_path / tool.FAMILY_CACHE_FILENAME).write_text("")
+
+    result = pretend.stub(returncode=0, stderr=b"gcc version 9.4.0")
+    subprocess = _stub_subprocess(result)
+    monkeypatch.setattr(tool, "subprocess", subprocess)
+
+    def _open(*args, **kwargs):
+        raise PermissionError("nope")
+
+    monkeypatch.setattr(Path, "open", _open)
+
+    assert tool.CC([]).family == CompilerFamily.Gcc
+    assert len(subprocess.run.calls) == 1
+
+
+def test_compilertool_family_cache_dir_malformed(monkeypatch, tmp_path):
+    monkeypatch.setenv("BLIGHT_CACHE_DIR", str(tmp_path))
+    (tmp_path / tool.FAMILY_CACHE_FILENAME).write_text('not json\n{"path": 1}\n')
+
+    result = pretend.stub(returncode=0, stderr=b"clang version 10.0.0-4ubuntu1")
+    subprocess = _stub_subprocess(result)
+    monkeypatch.setattr(tool, "subprocess", subprocess)
+
+    assert tool.CC([]).family == CompilerFamily.MainlineLlvm
+    assert len(subprocess.run.calls) == 1
+
+
+def test_compilertool_family_cache_dir_missing_tool(monkeypatch, tmp_path):
+    monkeypatch.setenv("BLIGHT_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("BLIGHT_WRAPPED_CC", "/this/compiler/does/not/exist")
+
+    result = pretend.stub(returncode=0, stderr=b"gcc version 9.4.0")
+    subprocess = _stub_subprocess(result)
+    monkeypatch.setattr(tool, "subprocess", subprocess)
+
+    assert tool.CC([]).family == CompilerFamily.Gcc
+    assert subprocess.run.calls == [
+        pretend.call(
+            ["/this/compiler/does/not/exist", "-###"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            close_fds=False,
+        )
+    ]
+    assert not (tmp_path / tool.FAMILY_CACHE_FILENAME).exists()
+
+
 def test_tool_missing_wrapped_tool(monkeypatch):
     monkeypatch.delenv("BLIGHT_WRAPPED_CC")
     with pytest.raises(BlightError):
         tool.CC.wrapped_tool()
 
 
+def test_tool_wrapped_tool_reads_env(monkeypatch):
+    monkeypatch.setenv("BLIGHT_WRAPPED_CC", "foo")
+    assert tool.CC.wrapped_tool() == "foo"
+
+    monkeypatch.setenv("BLIGHT_WRAPPED_CC", "bar")
+    assert tool.CC.wrapped_tool() == "bar"
+    assert tool.CXX._wrapped_tool_env() == "BLIGHT_WRAPPED_CXX"
+
+
 def test_tool_fails(monkeypatch):
     monkeypatch.setenv("BLIGHT_WRAPPED_CC", "false")
     with pytest.raises(BuildError):
         tool.CC([]).run()
 
 
+def test_tool_run_replace_process(monkeypatch):
+    monkeypatch.setenv("BLIGHT_WRAPPED_CC", "true")
+    execvpe = pretend.call_recorder(lambda file, args, env: None)
+    monkeypatch.setattr(os, "execvpe", execvpe)
+
+    cc = tool.CC(["-v"])
+    cc.run(replace_process=True)
+
+    assert execvpe.calls == [pretend.call("true", ["true", "-v"], cc._env)]
+
+
+@pytest.mark.parametrize("journaling", [True, False])
+def test_tool_run_replace_process_with_actions(monkeypatch, tmp_path, journaling):
+    if journaling:
+        monkeypatch.setenv("BLIGHT_JOURNAL_PATH", str(tmp_path / "journal.jsonl"))
+    else:
+        monkeypatch.setenv("BLIGHT_ACTIONS", "Lint")
+    execvpe = pretend.call_recorder(lambda file, args, env: None)
+    monkeypatch.setattr(os, "execvpe", execvpe)
+
+    tool.CC(["-v"]).run(replace_process=True)
+
+    assert execvpe.calls == []
+
+
+def test_tool_cwd_resolved(monkeypatch, tmp_path):
+    real = tmp_path / "real"
+    real.mkdir()
+    link = tmp_path / "link"
+    link.symlink_to(real)
+    monkeypatch.chdir(link)
+
+    assert tool.CC([]).cwd == real.resolve()
+
+
 def test_tool_env_filters_swizzle_path(monkeypatch):
     path = os.getenv("PATH")
     monkeypatch.setenv("PATH", f"/tmp/does-not-exist-{util.SWIZZLE_SENTINEL}:{path}")
@@ -184,6 +397,100 @@ def test_tool_run_journaling_multiple(monkeypatch, tmp_path):
     assert count == 10
 
 
+def test_tool_run_parallel_actions(monkeypatch, tmp_path):
+    journal_output = tmp_path / "journal.jsonl"
+    monkeypatch.setenv("BLIGHT_ACTIONS", "Record:Benchmark:IgnoreWerror:FindOutputs:Lint")
+    monkeypatch.setenv("BLIGHT_ACTIONS_PARALLEL", "1")
+    monkeypatch.setenv("BLIGHT_JOURNAL_PATH", str(journal_output))
+
+    cc = tool.CC(["-v", "-Werror"])
+    cc.run()
+
+    journal = json.loads(journal_output.read_text())
+    assert list(journal.keys()) == ["Record", "Benchmark", "IgnoreWerror", "FindOutputs", "Lint"]
+    assert journal["Record"]["args"] == ["-v"]
+
+
+def test_tool_run_parallel_actions_skip_run(monkeypatch, tmp_path):
+    journal_output = tmp_path / "journal.jsonl"
+    monkeypatch.setenv("BLIGHT_ACTIONS", "SkipStrip:Benchmark")
+    monkeypatch.setenv("BLIGHT_ACTIONS_PARALLEL", "1")
+    monkeypatch.setenv("BLIGHT_JOURNAL_PATH", str(journal_output))
+
+    strip = tool.STRIP(["does-not-exist"])
+    strip.run()
+
+    journal = json.loads(journal_output.read_text())
+    assert journal["Benchmark"]["run_skipped"]
+
+
+@pytest.mark.parametrize("value", ["0", "false", "", "yes"])
+def test_tool_run_parallel_actions_not_enabled(monkeypatch, value):
+    monkeypatch.setenv("BLIGHT_ACTIONS", "Record:Benchmark")
+    monkeypatch.setenv("BLIGHT_ACTION_RECORD", "output=/dev/null")
+    monkeypatch.setenv("BLIGHT_ACTION_BENCHMARK", "output=/dev/null")
+    monkeypatch.setenv("BLIGHT_ACTIONS_PARALLEL", value)
+
+    executor = pretend.raiser(AssertionError("actions should run sequentially"))
+    monkeypatch.setattr(tool.concurrent.futures, "ThreadPoolExecutor", executor)
+
+    cc = tool.CC(["-v"])
+    assert not cc._actions_parallel
+    cc.run()
+
+
+@pytest.mark.parametrize("actions", ["IgnoreWerror:IgnoreFlto", "Record:IgnoreWerror:Benchmark"])
+def test_tool_run_parallel_actions_no_concurrent_batch(monkeypatch, actions):
+    monkeypatch.setenv("BLIGHT_ACTIONS", actions)
+    monkeypatch.setenv("BLIGHT_ACTION_RECORD", "output=/dev/null")
+    monkeypatch.setenv("BLIGHT_ACTION_BENCHMARK", "output=/dev/null")
+    monkeypatch.setenv("BLIGHT_ACTIONS_PARALLEL", "1")
+
+    executor = pretend.raiser(AssertionError("actions should run sequentially"))
+    monkeypatch.setattr(tool.concurrent.futures, "ThreadPoolExecutor", executor)
+
+    cc = tool.CC(["-v", "-Werror"])
+    cc.run()
+    assert cc.args == ["-v"]
+
+
+@pytest.mark.parametrize(
+    ("tool_class", "args", "outputs", "new_args", "new_outputs"),
+    [
+        (tool.CC, ["-ofoo"], ["foo"], ["-c", "-obar"], ["bar"]),
+        (tool.LD, ["--output=foo"], ["foo"], [], ["a.out"]),
+        (tool.AR, ["rcs", "foo.a"], ["foo.a"], ["rcs", "bar.a"], ["bar.a"]),
+    ],
+)
+def test_tool_outputs_cached(tool_class, args, outputs, new_args, new_outputs):
+    t = tool_class(args)
+    assert t.outputs == outputs
+    assert t.outputs is t.outputs
+
+    t.args = new_args
+    assert t.outputs == new_outputs
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "foo",
+        "foo.c",
+        "foo.tar.gz",
+        "a/b.c",
+        "dir.d/foo",
+        "foo/",
+        ".bashrc",
+        "a/.c",
+        "foo.",
+        "..c",
+        "-",
+    ],
+)
+def test_rename_suffix(path):
+    assert tool._rename_suffix(path, ".o") == Path(path).with_suffix(".o").name
+
+
 def test_tool_args_property():
     cpp = tool.CPP(["a", "b", "c"])
 
@@ -207,9 +514,33 @@ def test_tool_inputs(tmp_path):
     assert cc.inputs == [str(foo_input), str(bar_input), "-"]
 
 
+def test_tool_inputs_relative(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "foo.c").touch()
+    (tmp_path / "bar.c").mkdir()
+
+    cc = tool.CC(["foo.c", "bar.c", "-o", "foo.c", "-aux-info", "foo.c", "-o", "-", "missing.c"])
+
+    assert cc.inputs == ["foo.c", "-"]
+
+
+def test_tool_inputs_invalidated_by_args(tmp_path):
+    foo_input = (tmp_path / "foo.c").resolve()
+    foo_input.touch()
+
+    cc = tool.CC([str(foo_input)])
+    assert cc.inputs == [str(foo_input)]
+
+    cc.args = ["-", *cc.args]
+    assert cc.inputs == ["-", str(foo_input)]
+
+
 def test_tool_output(tmp_path):
     assert tool.CC(["-ofoo"]).outputs == ["foo"]
     assert tool.CC(["-o", "foo"]).outputs == ["foo"]
+    assert tool.CC(["-o", "foo", "-obar"]).outputs == ["bar"]
+    assert tool.CC(["-ofoo", "-o"]).outputs == ["foo"]
+    assert tool.CPP(["-o"]).outputs == []
     assert tool.CC(["foo.c"]).outputs == ["a.out"]
     assert tool.CC(["-E"]).outputs == ["-"]
 
@@ -245,6 +576,15 @@ def test_tool_response_file(tmp_path):
     assert cc.opt == OptLevel.O3
 
 
+def test_tool_response_file_quoting(tmp_path):
+    contents = '-DFOO=\'a b\' "-DBAR=c\\"d" -I\\ e #not-a-comment\n-O3\n'
+    response_file = (tmp_path / "args").resolve()
+    response_file.write_text(contents)
+
+    cc = tool.CC([f"@{response_file}"])
+    assert cc.canonicalized_args == shlex.split(contents)
+
+
 def test_tool_response_file_nested(tmp_path):
     response_file1 = (tmp_path / "args").resolve()
     response_file1.write_text("-some -flags @args2 -more -flags")
@@ -265,6 +605,100 @@ def test_tool_response_file_nested(tmp_path):
     assert cc.opt == OptLevel.O3
 
 
+def test_tool_response_file_nested_relative(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "args").write_text("-a @sub/args -b @missing -c")
+    (tmp_path / "sub" / "args").write_text("-d @args2 -e")
+    (tmp_path / "sub" / "args2").write_text("-f")
+
+    cc = tool.CC([f"@{tmp_path / 'args'}"])
+    assert cc.canonicalized_args == ["-a", "-d", "-f", "-e", "-b", "-c"]
+
+
+def test_tool_response_file_multiple(tmp_path):
+    response_file1 = (tmp_path / "args1").resolve()
+    response_file1.write_text("-a1 -a2 @args3 @args3")
+    response_file2 = (tmp_path / "args2").resolve()
+    response_file2.write_text("-b1")
+    response_file3 = (tmp_path / "args3").resolve()
+    response_file3.write_text("-c1 -c2")
+
+    cc = tool.CC([f"@{response_file1}", "-x", f"@{response_file2}", "-y"])
+    assert cc.canonicalized_args == [
+        "-a1",
+        "-a2",
+        "-c1",
+        "-c2",
+        "-c1",
+        "-c2",
+        "-x",
+        "-b1",
+        "-y",
+    ]
+
+
+def test_tool_response_file_expanded_once(monkeypatch, tmp_path):
+    response_file = (tmp_path / "args").resolve()
+    response_file.write_text("-O3")
+
+    cc = tool.CC([f"@{response_file}"])
+    expand = pretend.call_recorder(cc._expand_response_file)
+    monkeypatch.setattr(cc, "_expand_response_file", expand)
+
+    assert cc.canonicalized_args == ["-O3"]
+    assert cc.canonicalized_args == ["-O3"]
+    assert len(expand.calls) == 1
+
+    cc.args = [*cc.args, f"@{response_file}"]
+    assert cc.canonicalized_args == ["-O3", "-O3"]
+    assert len(expand.calls) == 3
+
+
+def test_tool_response_file_rewritten(tmp_path):
+    response_file = (tmp_path / "args").resolve()
+    response_file.write_text("-O1")
+
+    cc = tool.CC([f"@{response_file}"])
+    assert cc.canonicalized_args == ["-O1"]
+
+    response_file.write_text("-O2 -c")
+    os.utime(response_file, ns=(0, 0))
+
+    cc = tool.CC([f"@{response_file}"])
+    assert cc.canonicalized_args == ["-O2", "-c"]
+
+
+def test_tool_response_file_rewritten_same_mtime(tmp_path):
+    response_file = (tmp_path / "args").resolve()
+    response_file.write_text("-O1")
+    os.utime(response_file, ns=(0, 0))
+
+    cc = tool.CC([f"@{response_file}"])
+    assert cc.canonicalized_args == ["-O1"]
+
+    # Rewritten in place, within the same mtime.
+    response_file.write_text("-O2 -c")
+    os.utime(response_file, ns=(0, 0))
+
+    cc = tool.CC([f"@{response_file}"])
+    assert cc.canonicalized_args == ["-O2", "-c"]
+
+    # Replaced with a same-sized file, within the same mtime.
+    replacement = tmp_path / "args.new"
+    replacement.write_text("-O3 -S")
+    os.utime(replacement, ns=(0, 0))
+    replacement.replace(response_file)
+
+    cc = tool.CC([f"@{response_file}"])
+    assert cc.canonicalized_args == ["-O3", "-S"]
+
+
+def test_tool_response_file_directory(tmp_path):
+    cc = tool.CC([f"@{tmp_path}"])
+
+    assert cc.canonicalized_args == []
+
+
 def test_tool_response_file_invalid_file():
     cc = tool.CC(["@/this/file/does/not/exist"])
 
@@ -311,6 +745,85 @@ def test_tool_library_names():
     assert cc.library_names == ["libfoo", "libbar", "libiberty"]
 
 
+def test_tool_library_names_long_forms():
+    cc = tool.CC(["--library=foo", "--library-path=/lib", "--library", "bar", "--libraryfoo"])
+    assert cc.library_names == ["libfoo", "libbar"]
+    assert cc.explicit_library_search_paths == [Path("/lib").resolve()]
+
+
+def test_tool_link_search_mixed_forms_ordered():
+    cc = tool.CC(
+        shlex.split("-Lb --library-path a -L c -lb --library=a -l c --library-path=d --library d")
+    )
+    assert cc.explicit_library_search_paths == [cc.cwd / p for p in ["b", "a", "c", "d"]]
+    assert cc.library_names == ["libb", "liba", "libc", "libd"]
+
+
+def test_tool_explicit_library_search_paths_cached(monkeypatch):
+    cc = tool.CC(["-Lfoo", "-Lbar", "-Lfoo"])
+
+    resolve = pretend.call_recorder(Path.resolve)
+    monkeypatch.setattr(Path, "resolve", resolve)
+
+    paths = cc.explicit_library_search_paths
+    assert paths == [cc.cwd / "foo", cc.cwd / "bar", cc.cwd / "foo"]
+    assert len(resolve.calls) == 2
+    assert cc.explicit_library_search_paths is paths
+
+    cc.args = ["-Lbaz"]
+    assert cc.explicit_library_search_paths == [cc.cwd / "baz"]
+
+
+def test_tool_link_search_missing_values():
+    cc = tool.CC(["-lfoo", "-L"])
+    assert cc.library_names == ["libfoo"]
+    assert cc.explicit_library_search_paths == []
+
+    cc = tool.CC(["-Lfoo", "--library"])
+    assert cc.library_names == []
+    assert cc.explicit_library_search_paths == [cc.cwd / "foo"]
+
+    cc = tool.CC(["-l"])
+    assert cc.library_names == []
+
+    cc = tool.CC(["--library-path"])
+    assert cc.explicit_library_search_paths == []
+
+
+def test_tool_arg_index_exact_flags():
+    cc = tool.CC(["-cfoo", "-ansify", "-###x"])
+    assert cc.stage == CompilerStage.AllStages
+    assert cc.std == Std.GnuUnknown
+
+
+def test_tool_arg_index_invalidated_by_args():
+    cc = tool.CC(["-O2", "-Dfoo", "-c"])
+    assert cc.opt == OptLevel.O2
+    assert cc.defines == [("foo", "1")]
+    assert cc.stage == CompilerStage.CompileObject
+
+    cc.args = [*cc.args, "-Ufoo", "-O3", "-S", "-E"]
+    assert cc.opt == OptLevel.O3
+    assert cc.defines == []
+    assert cc.stage == CompilerStage.Preprocess
+
+
+def test_tool_std_computes_lang_once(caplog):
+    cc = tool.CC(["-ansi"])
+
+    with caplog.at_level("WARNING", logger="blight.tool"):
+        assert cc.std == Std.C89
+    assert len(caplog.records) == 1
+
+
+def test_tool_std_explicit_skips_lang(caplog):
+    cc = tool.CC(["-std=gnu11", "-x"])
+
+    with caplog.at_level("WARNING", logger="blight.tool"):
+        assert cc.std == Std.Gnu11
+    assert caplog.records == []
+
+
 @pytest.mark.parametrize(
     ("flags", "defines", "undefines"),
     [
@@ -326,6 +839,8 @@ def test_tool_library_names():
         ("-Dkey='value=x'", [("key", "value=x")], {}),
         ("-D'FOO(x)=x+1'", [("FOO(x)", "x+1")], {}),
         ("-D 'FOO(x)=x+1'", [("FOO(x)", "x+1")], {}),
+        ("-Dfoo -D", [("foo", "1")], {}),
+        ("-Ufoo -U", [], {"foo": 0}),
     ],
 )
 def test_defines_mixin(flags, defines, undefines):
@@ -355,6 +870,22 @@ def test_codemodel_mixin(flags, code_model):
     assert cc.code_model == code_model
 
 
+@pytest.mark.parametrize(
+    ("flags", "opt"),
+    [
+        ("-O4", OptLevel.O3),
+        ("-O42", OptLevel.O3),
+        ("-O05", OptLevel.Unknown),
+        ("-O4x", OptLevel.Unknown),
+        ("-O\u0664", OptLevel.Unknown),
+    ],
+)
+def test_opt_mixin_high_levels(flags, opt):
+    cc = tool.CC([flags])
+
+    assert cc.opt == opt
+
+
 @pytest.mark.parametrize(
     ("flags", "lang", "std", "stage", "opt"),
     [
@@ -500,6 +1031,12 @@ def test_ld():
         ("-ofoo", "foo"),
         ("--output foo", "foo"),
         ("--output=foo", "foo"),
+        ("--output=foo --output bar", "bar"),
+        ("--output foo --output=bar", "bar"),
+        ("--output=foo --outputs", "foo"),
+        ("--output=foo --output", "foo"),
+        ("--outputfoo", "a.out"),
+        ("--output=foo=bar", "foo=bar"),
     ],
 )
 def test_ld_output_forms(flags, output):
@@ -546,6 +1083,8 @@ def test_ar():
         ("r foo.a bar.o", ["foo.a"]),
         ("ru foo.a bar.o", ["foo.a"]),
         ("d foo.a bar.o", ["foo.a"]),
+        ("cr lib/foo.bar.a foo.a.o", ["lib/foo.bar.a"]),
+        ("cr foo.a.o", []),
         ("--help", []),
     ],
 )
@@ -628,3 +1167,68 @@ def test_install_inputs_and_outputs(flags, directory_mode, inputs, outputs):
     assert install.directory_mode == directory_mode
     assert install.inputs == inputs
     assert install.outputs == outputs
+
+
+def test_install_parser_shared():
+    install1 = tool.INSTALL(["-d", "foo"])
+    install2 = tool.INSTALL(["foo", "bar"])
+
+    assert install1._parser is install2._parser
+    assert install1.directory_mode
+    assert not install2.directory_mode
+
+
+def test_install_dest_checked_once_per_access(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "dest").mkdir()
+
+    isdir = pretend.call_recorder(os.path.isdir)
+    monkeypatch.setattr(os.path, "isdir", isdir)
+
+    install = tool.INSTALL(["foo", "bar", "dest"])
+    assert install.inputs == ["foo", "bar"]
+    assert install.outputs == [str(tmp_path / "dest" / "foo"), str(tmp_path / "dest" / "bar")]
+    assert isdir.calls == [pretend.call(os.path.join(install.cwd, "dest"))] * 2
+
+
+def test_install_dest_created_by_run(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+
+    def run(args, **kwargs):
+        (tmp_path / "newdir").mkdir()
+        return pretend.stub(returncode=0)
+
+    monkeypatch.setattr(tool.subprocess, "run", run)
+
+    install = tool.INSTALL(["src", "newdir/"])
+    assert install.outputs == ["newdir/"]
+
+    install.run()
+    assert install.outputs == [str(tmp_path / "newdir" / "src")]
+
+
+def test_install_absolute_dest(tmp_path):
+    dest = tmp_path / "dest"
+    dest.mkdir()
+
+    install = tool.INSTALL(["foo", "bar/baz", str(dest)])
+    assert install.inputs == ["foo", "bar/baz"]
+    assert install.outputs == [str(dest / "foo"), str(dest / "baz")]
+
+
+def test_install_parses_lazily(monkeypatch):
+    parse_known_args = pretend.call_recorder(tool.INSTALL._install_parser().parse_known_args)
+    monkeypatch.setattr(tool.INSTALL._install_parser(), "parse_known_args", parse_known_args)
+
+    install = tool.INSTALL(["-d", "foo"])
+    assert repr(install) == f"<INSTALL {install.wrapped_tool()}>"
+    assert parse_known_args.calls == []
+
+    assert install.directory_mode
+    assert install.outputs == ["foo"]
+    assert len(parse_known_args.calls) == 1
+
+    install.args = ["foo", "bar"]
+    assert not install.directory_mode
+    assert install.outputs == ["bar"]
+    assert len(parse_known_args.calls) == 2
@@ -1,4 +1,5 @@
 import os
+import shlex
 from pathlib import Path
 
 import pretend
@@ -32,10 +33,50 @@ def test_collect_option_values():
     ]
 
 
+@pytest.mark.parametrize(
+    "value",
+    [
+        "",
+        "   ",
+        "-g -O0\t-DFOO=1\n-Wall",
+        "-DFOO='a b'",
+        '-DFOO="a b" -DBAR=\\"',
+        "-I\\ foo",
+        "-DFOO=\u00e9 -Wall",
+        "-g\x0b-O0",
+        "# not a comment",
+    ],
+)
+def test_shell_split(value):
+    assert util.shell_split(value) == shlex.split(value)
+
+
 def test_rindex():
     assert util.rindex([1, 1, 2, 3, 4, 5], 1) == 1
     assert util.rindex([1, 1, 2, 3, 4, 5], 6) is None
     assert util.rindex([1, 1, 2, 3, 4, 5], 5) == 5
+    assert util.rindex(("-o", "foo", "-o", "bar"), "-o") == 2
+    assert util.rindex([], "-o") is None
+
+
+def test_rindex_prefix():
+    assert util.rindex_prefix(["-ofoo", "-o", "bar"], "-o") == 1
+    assert util.rindex_prefix(["-ofoo", "-o", "bar"], "-x") is None
+
+
+def test_ritem_prefix():
+    assert util.ritem_prefix(["-xc", "-xc++", "foo"], "-x") == "-xc++"
+    assert util.ritem_prefix(["-xc", "-xc++", "foo"], "-o") is None
+
+
+def test_insert_items_at_idx(capsys):
+    assert util.insert_items_at_idx([1, 2, 3], 1, ["a", "b"]) == [1, "a", "b", 3]
+    assert util.insert_items_at_idx([1, 2, 3], 0, []) == [2, 3]
+    assert util.insert_items_at_idx([1, 2, 3], 2, ["a"]) == [1, 2, "a"]
+    assert util.insert_items_at_idx((1, 2, 3), 1, ("a",)) == [1, "a", 3]
+    assert util.insert_items_at_idx([1, 2, 3], 3, ["a"]) == [1, 2, 3]
+    assert util.insert_items_at_idx([1, 2, 3], -1, ["a"]) == [1, 2, 3]
+    assert capsys.readouterr().out == ""
 
 
 def test_load_actions(monkeypatch):
@@ -62,6 +103,26 @@ def test_load_actions_preserves_order(monkeypatch):
     assert [a.__class__.__name__ for a in actions] == ["Benchmark", "Record", "FindOutputs"]
 
 
+def test_load_actions_cached(monkeypatch):
+    monkeypatch.setenv("BLIGHT_ACTIONS", "Record:Benchmark")
+    monkeypatch.setenv("BLIGHT_ACTION_RECORD", "output=/tmp/a.jsonl")
+    util._load_action_specs.cache_clear()
+
+    actions1 = util.load_actions()
+    actions2 = util.load_actions()
+    assert util._load_action_specs.cache_info().misses == 1
+
+    # Each load produces fresh (unshared) actions and configurations.
+    assert [a.__class__ for a in actions1] == [a.__class__ for a in actions2]
+    assert all(a1 is not a2 for (a1, a2) in zip(actions1, actions2))
+    assert actions1[0]._config == actions2[0]._config == {"output": "/tmp/a.jsonl"}
+    assert actions1[0]._config is not actions2[0]._config
+
+    # Changing an action's configuration is reflected in subsequent loads.
+    monkeypatch.setenv("BLIGHT_ACTION_RECORD", "output=/tmp/b.jsonl")
+    assert util.load_actions()[0]._config == {"output": "/tmp/b.jsonl"}
+
+
 def test_load_actions_nonexistent(monkeypatch):
     monkeypatch.setenv("BLIGHT_ACTIONS", "ThisActionDoesNotExist")
 
@@ -69,6 +130,14 @@ def test_load_actions_nonexistent(monkeypatch):
         util.load_actions()
 
 
+@pytest.mark.parametrize("name", ["record", "Action", "__name__"])
+def test_load_actions_not_an_action(monkeypatch, name):
+    monkeypatch.setenv("BLIGHT_ACTIONS", name)
+
+    with pytest.raises(BlightError):
+        util.load_actions()
+
+
 def test_load_actions_empty_variable(monkeypatch):
     monkeypatch.setenv("BLIGHT_ACTIONS", "")
 
@@ -85,6 +154,19 @@ def test_load_actions_empty_config(monkeypatch):
     assert actions[0]._config == {}
 
 
+def test_unswizzled_path(monkeypatch):
+    monkeypatch.setenv("PATH", f"/foo:/tmp/bar{util.SWIZZLE_SENTINEL}:/baz")
+    assert util.unswizzled_path() == "/foo:/baz"
+
+    monkeypatch.setenv("PATH", "/quux")
+    assert util.unswizzled_path() == "/quux"
+
+    monkeypatch.setenv(
+        "PATH", f"/tmp/bar{util.SWIZZLE_SENTINEL}/:/tmp/{util.SWIZZLE_SENTINEL}/bin:/baz"
+    )
+    assert util.unswizzled_path() == f"/tmp/{util.SWIZZLE_SENTINEL}/bin:/baz"
+
+
 def test_json_helper_asdict():
     has_asdict = pretend.stub(asdict=lambda: {"foo": "bar"})
 
@@ -104,3 +186,40 @@ def test_json_helper_typeerror():
 
     with pytest.raises(TypeError):
         util.json_helper(junk)
+
+
+def test_flock_append_flushes_under_lock(monkeypatch, tmp_path):
+    path = tmp_path / "out.jsonl"
+    contents_at_unlock = []
+
+    def flock(io, op):
+        if op == util.fcntl.LOCK_UN:
+            contents_at_unlock.append(path.read_text())
+
+    monkeypatch.setattr(util.fcntl, "flock", flock)
+
+    with util.flock_append(path) as io:
+        io.write("foo\n")
+
+    assert contents_at_unlock == ["foo\n"]
+
+
+def test_argument_parser_default_namespace():
+    parser = util.ArgumentParser(add_help=False)
+    parser.add_argument("-a", dest="shared")
+    parser.add_argument("-b", dest="shared", default="b")
+    parser.add_argument("-c", dest="shared", default="c")
+    parser.add_argument("-d", action="store_true")
+    parser.add_argument("-e", dest="extra")
+    parser.set_defaults(extra="parser-default")
+
+    namespace = parser.default_namespace()
+    assert vars(namespace) == {
+        action.dest: parser.get_default(action.dest) for action in parser._actions
+    }
+    assert namespace.shared == "b"
+    assert namespace.d is False
+    assert namespace.extra == "parser-default"
+
+    with pytest.raises(ValueError):
+        parser.parse_args(["--bogus"])